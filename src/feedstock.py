@@ -1,9 +1,167 @@
 import chemics as cm
+import functools
+import json
 import numpy as np
+import re
+import scipy
 from objfunc import objfunc
+from pathlib import Path
 from scipy.optimize import minimize
 
 
+# Folder for the optimized splitting parameters saved by `calc_biocomp`,
+# located in the repository root so it does not depend on the working directory
+_splits_dir = Path(__file__).resolve().parent.parent / '.cache' / 'biocomp'
+
+# Settings for the splitting parameter optimization, saved with the parameters
+# so they are recalculated when a setting changes. Increase `_splits_version`
+# when `objfunc` changes.
+_splits_version = 1
+_splits_x0 = [0.6, 0.8, 0.8, 1, 1]
+_splits_bounds = [[0, 1]] * 5
+_splits_method = 'L-BFGS-B'
+
+# Mass fractions of H and O in moisture applied to the ultimate analysis values
+# [C, H, O, N, S, ash]
+_ult_moisture = np.array([0, 0.1119, 0.8881, 0, 0, 0])
+
+
+def _calc_prox_bases(prox_ad, ADL):
+    # Proximate analysis bases from the as-determined basis (ad) where each
+    # row of `prox_ad` is [FC, VM, ash, moisture] for a feedstock. A single
+    # feedstock is given as a 1-D array.
+
+    # Get as-determined (ad) values, slices keep a trailing axis so the scale
+    # factors broadcast over the columns of each row
+    ash_ad = prox_ad[..., 2:3]
+    M_ad = prox_ad[..., 3:4]
+
+    # Scale factors from as-determined basis (ad) to as-received basis (ar),
+    # dry basis (d), and dry ash-free basis (daf)
+    M_ar = (M_ad * (100 - ADL) / 100) + ADL
+    f_ar = (100 - M_ar) / (100 - M_ad)
+    f_d = 100 / (100 - M_ad)
+    f_daf = 100 / (100 - M_ad - ash_ad)
+
+    # Calculate proximate analysis bases in units of weight percent (wt. %)
+    # where ar is [FC, VM, ash, M], d is [FC, VM, ash], and daf is [FC, VM]
+    prox_ar = np.concatenate([prox_ad[..., :3] * f_ar, M_ar], axis=-1)
+    prox_d = prox_ad[..., :3] * f_d
+    prox_daf = prox_ad[..., :2] * f_daf
+
+    return prox_ar, prox_d, prox_daf
+
+
+def _calc_ult_bases(ult_ad, ADL):
+    # Ultimate analysis bases from the as-determined basis (ad) where each
+    # row of `ult_ad` is [C, H, O, N, S, ash, moisture] for a feedstock. A
+    # single feedstock is given as a 1-D array.
+
+    # Get as-determined (ad) values, slices keep a trailing axis so the scale
+    # factors broadcast over the columns of each row
+    ash_ad = ult_ad[..., 5:6]
+    M_ad = ult_ad[..., 6:7]
+
+    # Remove the H and O in the moisture from the reported H and O values
+    # where values are [C, H, O, N, S, ash]
+    ult_dry = ult_ad[..., :6] - M_ad * _ult_moisture
+
+    # Scale factors from as-determined basis (ad) to as-received basis (ar),
+    # dry basis (d), and dry ash-free basis (daf)
+    M_ar = (M_ad * ((100 - ADL) / 100)) + ADL
+    f_ar = (100 - M_ar) / (100 - M_ad)
+    f_d = 100 / (100 - M_ad)
+    f_daf = 100 / (100 - M_ad - ash_ad)
+
+    # Calculate ultimate analysis bases in units of weight percent (wt. %)
+    # where ar is [C, H, O, N, S, ash, M], d is [C, H, O, N, S, ash], and
+    # daf is [C, H, O, N, S]
+    ult_ar = np.concatenate([ult_dry * f_ar, M_ar], axis=-1)
+    ult_d = ult_dry * f_d
+    ult_daf = ult_dry[..., :5] * f_daf
+
+    # Calculate ultimate analysis CHO basis from daf basis in units of
+    # weight percent (wt. %)
+    N_daf = ult_daf[..., 3:4]
+    S_daf = ult_daf[..., 4:5]
+    ult_cho = ult_daf[..., :3] * (100 / (100 - N_daf - S_daf))
+
+    return ult_ar, ult_d, ult_daf, ult_cho
+
+
+def _lump(y):
+    # Lump the experiment yields [oil, condensables, light gas, water vapor,
+    # char] as the following
+    # gases = light gas
+    # liquids = oil + condensables + water vapor
+    # solids = char
+    lump = np.empty(3)
+    lump[0] = y[2]
+    lump[1] = y[0] + y[1] + y[3]
+    lump[2] = y[4]
+    return lump
+
+
+def _lump2(y):
+    # Another approach to lump the experiment yields as the following
+    # gases = light gas + condensables + water vapor
+    # liquids = oil
+    # solids = char
+    lump = np.empty(3)
+    lump[0] = y[2] + y[1] + y[3]
+    lump[1] = y[0]
+    lump[2] = y[4]
+    return lump
+
+
+def _chem_bc(chem_daf):
+    # Biomass composition [cellulose, hemicellulose, lignin] from the chemical
+    # analysis values where
+    # cellulose = glucan
+    # hemicellulose = xylan + galactan + arabinan + mannan + acetyl
+    bc = np.empty(3)
+    bc[0] = chem_daf[6]
+    bc[1] = chem_daf[7:12].sum()
+    bc[2] = chem_daf[5]
+    return bc
+
+
+@functools.lru_cache(maxsize=None)
+def _calc_splits(yc, yh, ybc):
+    # Determine optimized splitting parameters using default values for `x0`
+    # where each parameter is bound within 0 to 1. Results are cached for
+    # each set of C, H, and chemical analysis mass fractions `ybc`.
+    res = minimize(objfunc, _splits_x0, args=(yc, yh, ybc), method=_splits_method, bounds=_splits_bounds)
+    return tuple(res.x)
+
+
+def _load_splits(name, cycle, yc, yh, ybc):
+    # Optimized splitting parameters saved on disk for each feedstock so other
+    # runs skip the optimizer. The feedstock data and optimizer settings are
+    # saved with the parameters and the parameters are recalculated if any of
+    # them have changed.
+    slug = re.sub(r'\W+', '_', name).strip('_')
+    path = _splits_dir / f'{slug}_{cycle}.json'
+    inputs = {
+        'yc': yc, 'yh': yh, 'ybc': list(ybc),
+        'version': _splits_version, 'x0': _splits_x0, 'bounds': _splits_bounds,
+        'method': _splits_method, 'scipy': scipy.__version__
+    }
+
+    try:
+        saved = json.loads(path.read_text())
+    except (OSError, ValueError):
+        saved = None
+
+    if saved and saved.get('inputs') == inputs:
+        return tuple(saved['splits'])
+
+    splits = _calc_splits(yc, yh, tuple(ybc))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'inputs': inputs, 'splits': splits}))
+    return splits
+
+
 class Feedstock:
     """
     Feedstock properties.
@@ -105,11 +263,7 @@ class Feedstock:
         self.chem_daf = None
         self.chem_bc = None
         self.ADL = 22
-        self.exp_yield = np.array(data['yield'])
-        self.normexp_yield = np.array(data['yield']) / sum(np.array(data['yield'])) * 100
-        self.lump_yield = None
-        self.lump2_yield = None
-        self.normlump_yield = None
+        self.exp_yield = np.array(data['yield'], dtype=float)
 
         # Assign residence time if it is available
         if 'residenceTime' in data:
@@ -119,132 +273,49 @@ class Feedstock:
         self._prox_bases()
         self._ult_bases()
 
-        # Calculate lumped yields from experiment yield data
-        self._lump_yields()
-
         # Calculate chemical analysis bases
         self._chem_bases()
 
     def _prox_bases(self):
-        # Get as-determined (ad) values
-        FC_ad = self.prox_ad[0]
-        VM_ad = self.prox_ad[1]
-        ash_ad = self.prox_ad[2]
-        M_ad = self.prox_ad[3]
-        ADL = self.ADL
-
-        # Calculate proximate analysis as-received basis (ar) from
-        # as-determined basis (ad) in units of weight percent (wt. %)
-        M_ar = (M_ad * (100 - ADL) / 100) + ADL
-        FC_ar = FC_ad * (100 - M_ar) / (100 - M_ad)
-        VM_ar = VM_ad * (100 - M_ar) / (100 - M_ad)
-        ash_ar = ash_ad * (100 - M_ar) / (100 - M_ad)
-        self.prox_ar = np.array([FC_ar, VM_ar, ash_ar, M_ar])
-
-        # Calculate proximate analysis dry basis (d) from as-determined basis
-        # (ad) in units of weight percent (wt. %)
-        FC_d = FC_ad * 100 / (100 - M_ad)
-        VM_d = VM_ad * 100 / (100 - M_ad)
-        ash_d = ash_ad * 100 / (100 - M_ad)
-        self.prox_d = np.array([FC_d, VM_d, ash_d])
-
-        # Calculate proximate analysis dry ash-free basis (daf) from
-        # as-determined basis (ad) in units of weight percent (wt. %)
-        FC_daf = FC_ad * 100 / (100 - M_ad - ash_ad)
-        VM_daf = VM_ad * 100 / (100 - M_ad - ash_ad)
-        self.prox_daf = np.array([FC_daf, VM_daf])
+        # Calculate proximate analysis bases from as-determined basis (ad)
+        self.prox_ar, self.prox_d, self.prox_daf = _calc_prox_bases(self.prox_ad, self.ADL)
 
     def _ult_bases(self):
-        # Get as-determined (ad) values
-        C_ad = self.ult_ad[0]
-        H_ad = self.ult_ad[1]
-        O_ad = self.ult_ad[2]
-        N_ad = self.ult_ad[3]
-        S_ad = self.ult_ad[4]
-        ash_ad = self.ult_ad[5]
-        M_ad = self.ult_ad[6]
-        ADL = self.ADL
-
-        # Calculate ultimate analysis as-received basis (ar) from
-        # as-determined basis (ad) in units of weight percent (wt. %)
-        M_ar = (M_ad * ((100 - ADL) / 100)) + ADL
-        C_ar = C_ad * (100 - M_ar) / (100 - M_ad)
-        H_ar = (H_ad - 0.1119 * M_ad) * (100 - M_ar) / (100 - M_ad)
-        O_ar = (O_ad - 0.8881 * M_ad) * (100 - M_ar) / (100 - M_ad)
-        N_ar = N_ad * (100 - M_ar) / (100 - M_ad)
-        S_ar = S_ad * (100 - M_ar) / (100 - M_ad)
-        ash_ar = ash_ad * (100 - M_ar) / (100 - M_ad)
-        self.ult_ar = np.array([C_ar, H_ar, O_ar, N_ar, S_ar, ash_ar, M_ar])
-
-        # Calculate ultimate analysis dry basis (d) from as-determined basis
-        # (ad) in units of weight percent (wt. %)
-        C_d = C_ad * 100 / (100 - M_ad)
-        H_d = (H_ad - 0.1119 * M_ad) * 100 / (100 - M_ad)
-        O_d = (O_ad - 0.8881 * M_ad) * 100 / (100 - M_ad)
-        N_d = N_ad * 100 / (100 - M_ad)
-        S_d = S_ad * 100 / (100 - M_ad)
-        ash_d = ash_ad * 100 / (100 - M_ad)
-        self.ult_d = np.array([C_d, H_d, O_d, N_d, S_d, ash_d])
-
-        # Calculate ultimate analysis dry ash-free basis (daf) from
-        # as-determined basis (ad) in units of weight percent (wt. %)
-        C_daf = C_ad * 100 / (100 - M_ad - ash_ad)
-        H_daf = (H_ad - 0.1119 * M_ad) * 100 / (100 - M_ad - ash_ad)
-        O_daf = (O_ad - 0.8881 * M_ad) * 100 / (100 - M_ad - ash_ad)
-        N_daf = N_ad * 100 / (100 - M_ad - ash_ad)
-        S_daf = S_ad * 100 / (100 - M_ad - ash_ad)
-        self.ult_daf = np.array([C_daf, H_daf, O_daf, N_daf, S_daf])
-
-        # Calculate ultimate analysis CHO basis from daf basis in units of
-        # weight percent (wt. %)
-        C_cho = C_daf * 100 / (100 - N_daf - S_daf)
-        H_cho = H_daf * 100 / (100 - N_daf - S_daf)
-        O_cho = O_daf * 100 / (100 - N_daf - S_daf)
-        self.ult_cho = np.array([C_cho, H_cho, O_cho])
-
-    def _lump_yields(self):
-        # Calculate lumped yields from measured experiment yield data where
-        # experiment yields = [oil, condensables, light gas, water vapor, char]
-        # gases = light gas
-        # liquids = oil + condensables + water vapor
-        # solids = char
-        gases = self.exp_yield[2]
-        liquids = self.exp_yield[0] + self.exp_yield[1] + self.exp_yield[3]
-        solids = self.exp_yield[4]
-        self.lump_yield = np.array([gases, liquids, solids])
-
-        # Another approach to lump the experiment yields as the following
-        # gases = light gas + condensables + water vapor
-        # liquids = oil
-        # solids = char
-        gases = self.exp_yield[2] + self.exp_yield[1] + self.exp_yield[3]
-        liquids = self.exp_yield[0]
-        solids = self.exp_yield[4]
-        self.lump2_yield = np.array([gases, liquids, solids])
-
-        # Calculate normalized lumped yields from normalized experiment yield data.
-        norm_gases = self.normexp_yield[2]
-        norm_liquids = self.normexp_yield[0] + self.normexp_yield[1] + self.normexp_yield[3]
-        norm_solids = self.normexp_yield[4]
-        self.normlump_yield = np.array([norm_gases, norm_liquids, norm_solids])
+        # Calculate ultimate analysis bases from as-determined basis (ad)
+        self.ult_ar, self.ult_d, self.ult_daf, self.ult_cho = _calc_ult_bases(self.ult_ad, self.ADL)
 
     def _chem_bases(self):
         # Calculate the chemical analysis dry ash-free basis (daf) from the
         # dry basis in units of weight percent (wt. %).
         chem_d = self.chem_d
-        total_d = sum(chem_d)
-        chem_daf = chem_d * 100 / (total_d - chem_d[0] - chem_d[1])
+        total_daf = chem_d.sum() - chem_d[0] - chem_d[1]
+        chem_daf = chem_d * (100 / total_daf)
         chem_daf[0:2] = 0
         self.chem_daf = chem_daf
 
         # Calculate the biomass composition from chemical analysis dry
-        # ash-free basis (daf) values where
-        # cellulose = glucan
-        # hemicellulose = xylan + galactan + arabinan + mannan + acetyl
-        cell = chem_daf[6]
-        hemi = chem_daf[7] + chem_daf[8] + chem_daf[9] + chem_daf[10] + chem_daf[11]
-        lig = chem_daf[5]
-        self.chem_bc = np.array([cell, hemi, lig])
+        # ash-free basis (daf) values
+        self.chem_bc = _chem_bc(chem_daf)
+
+    @functools.cached_property
+    def normexp_yield(self):
+        # Normalize experiment yield data to a total of 100 wt. %
+        return self.exp_yield * (100 / self.exp_yield.sum())
+
+    @functools.cached_property
+    def lump_yield(self):
+        # Lumped yields from measured experiment yield data
+        return _lump(self.exp_yield)
+
+    @functools.cached_property
+    def lump2_yield(self):
+        # Lumped yields from measured experiment yield data
+        return _lump2(self.exp_yield)
+
+    @functools.cached_property
+    def normlump_yield(self):
+        # Normalized lumped yields from normalized experiment yield data
+        return _lump(self.normexp_yield)
 
     def calc_biocomp(self):
         """
@@ -258,17 +329,99 @@ class Feedstock:
         yh = self.ult_cho[1] / 100
         ybc = self.chem_bc / 100
 
-        # Determine optimized splitting parameters using default values for `x0`
-        # where each parameter is bound within 0 to 1
-        x0 = [0.6, 0.8, 0.8, 1, 1]
-        bnds = ((0, 1), (0, 1), (0, 1), (0, 1), (0, 1))
-        res = minimize(objfunc, x0, args=(yc, yh, ybc), method='L-BFGS-B', bounds=bnds)
+        # Optimized splitting parameters in order of [alpha, beta, gamma, delta, epsilon]
+        splits = np.array(_load_splits(self.name, self.cycle, yc, yh, ybc))
 
         # Calculate biomass composition as dry ash-free basis (daf)
-        bc = cm.biocomp(yc, yh, alpha=res.x[0], beta=res.x[1], gamma=res.x[2], delta=res.x[3], epsilon=res.x[4])
-        cell, hemi, ligc, ligh, ligo, tann, tgl = bc['y_daf']
-
-        # Optimized splitting parameters in order of [alpha, beta, gamma, delta, epsilon]
-        splits = np.array([res.x[0], res.x[1], res.x[2], res.x[3], res.x[4]])
+        bc = cm.biocomp(yc, yh, alpha=splits[0], beta=splits[1], gamma=splits[2], delta=splits[3], epsilon=splits[4])
 
         return bc, splits
+
+
+class Feedstocks:
+    """
+    Proximate and ultimate analysis properties for a collection of feedstocks.
+    Each row of an array attribute corresponds to a feedstock.
+
+    Parameters
+    ----------
+    fdata : list of dict
+        List of feedstock data. Required keys for each feedstock are name,
+        cycle, proximate, and ultimate.
+
+    Attributes
+    ----------
+    name : list of str
+        Name of each feedstock.
+    cycle : ndarray
+        Cycle (experiment) number corresponding to each feedstock.
+    prox_ad : ndarray
+        Proximate analysis as-determined basis (ad) as an (N, 4) array of
+        [FC, VM, ash, moisture] in units of weight percent (wt. %).
+    prox_ar : ndarray
+        Proximate analysis as-received basis (ar) as an (N, 4) array of
+        [FC, VM, ash, moisture] in units of weight percent (wt. %).
+    prox_d : ndarray
+        Proximate analysis dry basis (d) as an (N, 3) array of [FC, VM, ash]
+        in units of weight percent (wt. %).
+    prox_daf : ndarray
+        Proximate analysis dry ash-free basis (daf) as an (N, 2) array of
+        [FC, VM] in units of weight percent (wt. %).
+    ult_ad : ndarray
+        Ultimate analysis as-determined basis (ad) as an (N, 7) array of
+        [C, H, O, N, S, ash, moisture] in units of weight percent (wt. %).
+    ult_ar : ndarray
+        Ultimate analysis as-received basis (ar) as an (N, 7) array of
+        [C, H, O, N, S, ash, moisture] in units of weight percent (wt. %).
+    ult_d : ndarray
+        Ultimate analysis dry basis (d) as an (N, 6) array of
+        [C, H, O, N, S, ash] in units of weight percent (wt. %).
+    ult_daf : ndarray
+        Ultimate analysis dry ash-free basis (daf) as an (N, 5) array of
+        [C, H, O, N, S] in units of weight percent (wt. %).
+    ult_cho : ndarray
+        Ultimate analysis CHO basis as an (N, 3) array of [C, H, O] in units
+        of weight percent (wt. %).
+    ADL : int
+        Assume 22 wt. % for air-dry loss (ADL) when calculating as-received
+        basis (ar) from the as-determined basis (ad).
+    """
+
+    def __init__(self, fdata):
+        self.name = [fd['name'] for fd in fdata]
+        self.cycle = np.array([fd['cycle'] for fd in fdata])
+        self.prox_ad = np.array([fd['proximate'] for fd in fdata], dtype=float)
+        self.ult_ad = np.array([fd['ultimate'] for fd in fdata], dtype=float)
+        self.ADL = 22
+
+        # Calculate proximate and ultimate analysis bases for all feedstocks
+        self.prox_ar, self.prox_d, self.prox_daf = _calc_prox_bases(self.prox_ad, self.ADL)
+        self.ult_ar, self.ult_d, self.ult_daf, self.ult_cho = _calc_ult_bases(self.ult_ad, self.ADL)
+
+    def __len__(self):
+        return len(self.name)
+
+
+@functools.lru_cache(maxsize=None)
+def _read_fdata(path):
+    """
+    Contents of the feedstock JSON file at `path`, read once and reused.
+    """
+    return Path(path).read_bytes()
+
+
+def load_fdata(path='data/feedstocks.json'):
+    """
+    Feedstock data from the JSON file at `path`. The file is only read once
+    but each call returns a new list of dict so callers can modify it.
+    """
+    return json.loads(_read_fdata(path))
+
+
+@functools.lru_cache(maxsize=None)
+def load_feedstocks(path='data/feedstocks.json'):
+    """
+    Tuple of Feedstock objects for each feedstock in the JSON file at `path`.
+    The objects are only created once so their cached properties are reused.
+    """
+    return tuple(Feedstock(fd) for fd in load_fdata(path))
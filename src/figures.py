@@ -0,0 +1,53 @@
+"""
+Command line options and figure output shared by the run scripts.
+"""
+
+import argparse
+import os
+
+
+def parse_args():
+    """
+    Parse the command line options for a run script. The `--save` option
+    switches Matplotlib to the non-interactive Agg backend so figures can be
+    created without a display.
+
+    Returns
+    -------
+    args : Namespace
+        Options where `args.save` is True to save the figures and `args.plot`
+        is False to only print the results without plotting figures.
+    """
+    parser = argparse.ArgumentParser()
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('-s', '--save', action='store_true', help='save figures to the out folder instead of showing them')
+    group.add_argument('-n', '--no-plot', dest='plot', action='store_false',
+                       help='only print the results without plotting figures')
+    args = parser.parse_args()
+
+    if args.save:
+        import matplotlib
+        matplotlib.use('Agg')
+
+    return args
+
+
+def save_or_show(name, save):
+    """
+    Save all open figures to the `out` folder or show them.
+
+    Parameters
+    ----------
+    name : str
+        Prefix of the saved files which are named `out/<name>_<num>.png`
+    save : bool
+        Save the figures if True, otherwise show them.
+    """
+    import matplotlib.pyplot as plt
+
+    if save:
+        os.makedirs('out', exist_ok=True)
+        for num in plt.get_fignums():
+            plt.figure(num).savefig(f'out/{name}_{num}.png', dpi=100)
+    else:
+        plt.show()
@@ -0,0 +1,50 @@
+"""
+Inlet feed inputs for the CSTR reactor models.
+"""
+
+import chemics as cm
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def calc_feed(ghr_bio, slm_n2, p, temp):
+    """
+    Calculate the biomass and nitrogen gas mass flow rates into the reactor
+    and the mass fraction of nitrogen gas in the reactor feed.
+
+    Parameters
+    ----------
+    ghr_bio : float
+        Biomass inlet feedrate [g/hr]
+    slm_n2 : float
+        Inlet nitrogen gas flowrate [SLM]
+    p : float
+        Reactor absolute pressure [Pa]
+    temp : float
+        Reactor temperature [K]
+
+    Returns
+    -------
+    mf_bio : float
+        Biomass mass flow rate [kg/s]
+    mf_n2 : float
+        Nitrogen gas mass flow rate [kg/s]
+    y0_n2 : float
+        Mass fraction of nitrogen gas into reactor [-]
+    """
+
+    # Convert biomass feedrate from g/hr to kg/s
+    mf_bio = ghr_bio / 1000 / 3600
+
+    # Convert nitrogen gas flowrate from SLM to kg/s
+    # 1 m³/s = 60,000 liter/minute
+    # N₂ gas molecular weight = 28 g/mol
+    # N₂ gas density at STP = 1.2506 kg/m³
+    lpm_n2 = cm.slm_to_lpm(slm_n2, p / 1000, temp)
+    rhog_n2 = cm.rhog(28, 101325, 773.15)
+    mf_n2 = lpm_n2 / 60_000 * rhog_n2
+
+    # Mass fraction of nitrogen gas into reactor
+    y0_n2 = mf_n2 / (mf_n2 + mf_bio)
+
+    return mf_bio, mf_n2, y0_n2
@@ -3,12 +3,18 @@ Reactor module for batch and CSTR simulations.
 """
 
 import cantera as ct
+import functools
+import multiprocessing
 import numpy as np
+import sys
 
 # Disable warnings about discontinuity at polynomial mid-point in thermo data.
 # Remove this line to show the warnings.
 ct.suppress_thermo_warnings()
 
+# Chemical species representing biomass and moisture in the batch reactor feed
+sp_biomass = ('CELL', 'GMSW', 'LIGC', 'LIGH', 'LIGO', 'TANN', 'TGL', 'ACQUA')
+
 # Chemical species representing gas phase
 sp_gases = ('C2H4', 'C2H6', 'CH2O', 'CH4', 'CO', 'CO2', 'H2')
 
@@ -31,39 +37,172 @@ sp_metaplastics = (
     'GCH2O', 'GCO2', 'GCO', 'GCH3OH', 'GCH4', 'GC2H4', 'GC6H5OH', 'GCOH2',
     'GH2', 'GC2H6')
 
+# Carbon, hydrogen, and oxygen mass fractions of each gas species where rows
+# are [C, H, O] and columns are the species in `sp_gases`
+_cho_gases = np.array([
+    [0.86, 0.80, 0.40, 0.75, 0.43, 0.27, 0],
+    [0.14, 0.20, 0.07, 0.25, 0, 0, 1],
+    [0, 0, 0.53, 0, 0.57, 0.73, 0]
+])
+
+# Carbon, hydrogen, and oxygen mass fractions of each liquid species where
+# rows are [C, H, O] and columns are the species in `sp_liquids`
+_cho_liquids = np.array([
+    [
+        0.64, 0.62, 0.52, 0.45, 0.44, 0.78, 0.77, 0.57, 0.76, 0.49, 0.40,
+        0.55, 0.40, 0.37, 0.41, 0.78, 0.63, 0.00, 0.26, 0.77, 0.74, 0.63
+    ],
+    [
+        0.07, 0.10, 0.13, 0.06, 0.06, 0.07, 0.06, 0.05, 0.07, 0.08, 0.07,
+        0.09, 0.07, 0.13, 0.03, 0.07, 0.04, 0.11, 0.04, 0.12, 0.11, 0.05
+    ],
+    [
+        0.29, 0.28, 0.35, 0.48, 0.49, 0.15, 0.17, 0.38, 0.17, 0.43, 0.53,
+        0.36, 0.53, 0.50, 0.55, 0.15, 0.33, 0.89, 0.70, 0.11, 0.15, 0.32
+    ]
+])
 
-def run_batch_simulation(cti, pressure, temp, time, y0, energy):
+# Species and CHO mass fractions of the phases used by `get_ycho`
+_cho_phases = {'gases': (sp_gases, _cho_gases), 'liquids': (sp_liquids, _cho_liquids)}
+
+
+@functools.lru_cache(maxsize=None)
+def _species_indices(species_names, names):
     """
-    Run the batch reactor simulation.
+    Indices of the `names` species in the mechanism species `species_names`.
+    """
+    idx = np.array([species_names.index(sp) for sp in names])
+    idx.setflags(write=False)
+    return idx
+
+
+@functools.lru_cache(maxsize=None)
+def _phase_matrix(species_names, gases=sp_gases):
+    """
+    Indicator matrix where the rows flag the species in the gas, liquid,
+    solid, and metaplastic phases of the mechanism species `species_names`.
+    The gas phase species are given by `gases`.
     """
+    phases = (gases, sp_liquids, sp_solids, sp_metaplastics)
+    m = np.zeros((len(phases), len(species_names)))
+    for i, sp in enumerate(phases):
+        m[i, _species_indices(species_names, sp)] = 1
+    m.setflags(write=False)
+    return m
+
 
-    gas = ct.Solution(cti)
+@functools.lru_cache(maxsize=None)
+def _cho_matrix(species_names, phase):
+    """
+    Carbon, hydrogen, and oxygen mass fractions of the `phase` species placed
+    in the columns of the mechanism species `species_names`, other species are
+    zero.
+    """
+    sp, cho = _cho_phases[phase]
+    e = np.zeros((3, len(species_names)))
+    e[:, _species_indices(species_names, sp)] = cho
+    e.setflags(write=False)
+    return e
+
+
+@functools.lru_cache(maxsize=None)
+def load_gas(cti):
+    """
+    Load the Cantera input file once and reuse the phase for each simulation.
+    The returned phase is shared and its state is changed by every run, so a
+    SolutionArray built on it must not be kept while another simulation runs
+    in the same process.
+    """
+    return ct.Solution(cti)
+
+
+def get_mp_context():
+    """
+    Multiprocessing context for the process pools that run the simulations.
+    Linux uses fork so workers inherit the mechanism loaded by `load_gas` in
+    the parent process. Other platforms, such as macOS where fork is unsafe,
+    use the default start method and load the mechanism once per worker.
+    """
+    if sys.platform == 'linux':
+        return multiprocessing.get_context('fork')
+    return None
+
+
+def get_y0(cti, y_biomass):
+    """
+    Initial mass fractions of all the species in the Cantera input file where
+    `y_biomass` are the mass fractions of the `sp_biomass` species.
+    """
+    gas = load_gas(cti)
+    y0 = np.zeros(gas.n_species)
+    y0[_species_indices(tuple(gas.species_names), sp_biomass)] = y_biomass
+    return y0
+
+
+def _batch_reactor(cti, pressure, temp, y0, energy):
+    """
+    Create the batch reactor and the reactor network used to advance it.
+    """
+    gas = load_gas(cti)
     gas.TPY = temp, pressure, y0
 
     r = ct.IdealGasReactor(gas, energy=energy)
     sim = ct.ReactorNet([r])
-    states = ct.SolutionArray(gas, extra=['t'])
 
-    for t in time:
+    return gas, r, sim
+
+
+def run_batch_simulation(cti, pressure, temp, time, y0, energy):
+    """
+    Run the batch reactor simulation.
+    """
+
+    gas, r, sim = _batch_reactor(cti, pressure, temp, y0, energy)
+
+    # Preallocate the state [T, density, Y] at each time step
+    state = np.empty((len(time), 2 + gas.n_species))
+
+    for i, t in enumerate(time):
         sim.advance(t)
-        states.append(r.thermo.state, t=t)
+        state[i] = r.thermo.state
+
+    states = ct.SolutionArray(gas, states=state, extra={'t': time})
 
     return states
 
 
+def run_batch_yphases(cti, pressure, temp, time, y0, energy):
+    """
+    Run the batch reactor simulation and only keep the mass fractions of the
+    gas, liquid, solid, and metaplastic phases at each time step.
+    """
+
+    gas, r, sim = _batch_reactor(cti, pressure, temp, y0, energy)
+    m = _phase_matrix(tuple(gas.species_names))
+
+    # Preallocate the phase mass fractions at each time step
+    y = np.empty((len(time), len(m)))
+
+    for i, t in enumerate(time):
+        sim.advance(t)
+        y[i] = m @ r.thermo.Y
+
+    y_gas, y_liquid, y_solid, y_metaplastic = y.T
+    return y_gas, y_liquid, y_solid, y_metaplastic
+
+
 def run_cstr_simulation(cti, diam, length, n_cstrs, pressure, tau, temp, y0, energy):
     """
     Run the CSTR simulation.
     """
 
     # Setup gas phase
-    gas = ct.Solution(cti)
+    gas = load_gas(cti)
     gas.TPY = temp, pressure, y0
 
-    # Create a continuously stirred tank reactor (CSTR)
-    dz = length / n_cstrs
-    area = np.pi * (diam**2)
-    vol = area * dz
+    # Create a continuously stirred tank reactor (CSTR) where the volume is
+    # the area π⋅d² times the CSTR length L / n_cstrs
+    vol = np.pi * diam * diam * length / n_cstrs
     cstr = ct.IdealGasConstPressureReactor(gas, energy=energy, volume=vol)
 
     # Reservoirs for the inlet and outlet of each CSTR
@@ -79,58 +218,96 @@ def run_cstr_simulation(cti, diam, length, n_cstrs, pressure, tau, temp, y0, ene
     # Create a reactor network for performing the simulation
     sim = ct.ReactorNet([cstr])
 
-    # Store the results for each CSTR
-    states = ct.SolutionArray(cstr.thermo)
-    states.append(cstr.thermo.state)
+    # Thermo object of the CSTR contents, same object for every CSTR
+    thermo = cstr.thermo
+
+    # Preallocate the state [T, density, Y] for the inlet and each CSTR
+    state = np.empty((n_cstrs + 1, 2 + gas.n_species))
+    state[0] = thermo.state
+
+    # The outlet of the previous CSTR is the inlet of the next CSTR. The CSTR
+    # contents are left at the previous steady state which provides the
+    # initial guess for the next steady-state solution.
+    sync = inlet.syncState
+    reinitialize = sim.reinitialize
+    advance = sim.advance_to_steady_state
 
     for n in range(n_cstrs):
-        gas.TPY = cstr.thermo.TPY
-        inlet.syncState()
-        sim.reinitialize()
-        sim.advance_to_steady_state()
-        states.append(cstr.thermo.state)
+        gas.TPY = thermo.TPY
+        sync()
+        reinitialize()
+        advance()
+        state[n + 1] = thermo.state
+
+    states = ct.SolutionArray(thermo, states=state)
 
     return states
 
 
-def get_ycho_gases(states):
+def get_species_indices(states, names):
     """
-    Carbon, hydrogen, and oxygen fractions at each time step for each gas
-    species. Fraction values obtained from output of `ycho_fractions.py`.
+    Indices of the `names` species in the species of `states`.
     """
-    c_fracs = [0.86, 0.80, 0.40, 0.75, 0.43, 0.27, 0]
-    h_fracs = [0.14, 0.20, 0.07, 0.25, 0, 0, 1]
-    o_fracs = [0, 0, 0.53, 0, 0.57, 0.73, 0]
+    return _species_indices(tuple(states.species_names), tuple(names))
 
-    yc = states(*sp_gases).Y * c_fracs
-    yh = states(*sp_gases).Y * h_fracs
-    yo = states(*sp_gases).Y * o_fracs
 
-    return yc, yh, yo
+def get_yphases(states):
+    """
+    Mass fractions of the gas, liquid, solid, and metaplastic phases at each
+    time step.
+    """
+    m = _phase_matrix(tuple(states.species_names))
+    y_gas, y_liquid, y_solid, y_metaplastic = m @ states.Y.T
+    return y_gas, y_liquid, y_solid, y_metaplastic
 
 
-def get_ycho_liquids(states):
+def get_yphases_n2(states):
     """
-    Carbon, hydrogen, and oxygen fractions at each time step for each liquid
-    species. Fraction values obtained from output of `ycho_fractions.py`.
+    Mass fractions of the gas, liquid, solid, and metaplastic phases in each
+    CSTR where the gas phase includes the nitrogen gas (N₂ basis). The mass
+    fraction of the nitrogen gas in each CSTR is returned last.
     """
-    c_fracs = [
-        0.64, 0.62, 0.52, 0.45, 0.44, 0.78, 0.77, 0.57, 0.76, 0.49, 0.40,
-        0.55, 0.40, 0.37, 0.41, 0.78, 0.63, 0.00, 0.26, 0.77, 0.74, 0.63
-    ]
+    species_names = tuple(states.species_names)
+    m = _phase_matrix(species_names, sp_gases_n2)
+    y = states.Y
+    y_gas_n2, y_liquid_n2, y_solid_n2, y_metaplastic_n2 = m @ y.T
+    y_n2 = y[:, _species_indices(species_names, ('N2',))[0]]
+    return y_gas_n2, y_liquid_n2, y_solid_n2, y_metaplastic_n2, y_n2
 
-    h_fracs = [
-        0.07, 0.10, 0.13, 0.06, 0.06, 0.07, 0.06, 0.05, 0.07, 0.08, 0.07,
-        0.09, 0.07, 0.13, 0.03, 0.07, 0.04, 0.11, 0.04, 0.12, 0.11, 0.05
-    ]
 
-    o_fracs = [
-        0.29, 0.28, 0.35, 0.48, 0.49, 0.15, 0.17, 0.38, 0.17, 0.43, 0.53,
-        0.36, 0.53, 0.50, 0.55, 0.15, 0.33, 0.89, 0.70, 0.11, 0.15, 0.32
-    ]
+def n2_free_basis(y_gas_n2, y_liquid_n2, y_solid_n2, y_metaplastic_n2, y_n2):
+    """
+    Mass fractions of the gas, liquid, solid, and metaplastic phases
+    excluding the nitrogen gas (N₂ free basis) from the phase mass fractions
+    on an N₂ basis and the nitrogen gas mass fraction `y_n2`.
+    """
+    y = np.array([y_gas_n2 - y_n2, y_liquid_n2, y_solid_n2, y_metaplastic_n2])
+    y /= y.sum(axis=0)
+    y_gas, y_liquid, y_solid, y_metaplastic = y
+    return y_gas, y_liquid, y_solid, y_metaplastic
 
-    yc = states(*sp_liquids).Y * c_fracs
-    yh = states(*sp_liquids).Y * h_fracs
-    yo = states(*sp_liquids).Y * o_fracs
 
+def get_ycho(states, phase):
+    """
+    Carbon, hydrogen, and oxygen fractions of the `phase` at each time step
+    where `phase` is 'gases' or 'liquids'. Species fraction values obtained
+    from output of `ycho_fractions.py`.
+    """
+    e = _cho_matrix(tuple(states.species_names), phase)
+    yc, yh, yo = e @ states.Y.T
     return yc, yh, yo
+
+
+def get_ycho_gases(states):
+    """
+    Carbon, hydrogen, and oxygen fractions of the gas phase at each time step.
+    """
+    return get_ycho(states, 'gases')
+
+
+def get_ycho_liquids(states):
+    """
+    Carbon, hydrogen, and oxygen fractions of the liquid phase at each time
+    step.
+    """
+    return get_ycho(states, 'liquids')
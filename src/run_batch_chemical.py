@@ -6,11 +6,15 @@ acetaldehyde are detrimental to upgrading by catalytic pyrolysis. She also
 suggests that in general acids are bad such as acetic acid.
 """
 
-import json
-import matplotlib.pyplot as plt
 import numpy as np
 import reactor as rct
-from feedstock import Feedstock
+from feedstock import Feedstock, load_fdata
+from figures import parse_args, save_or_show
+
+# Command line options
+# ----------------------------------------------------------------------------
+
+args = parse_args()
 
 # Parameters
 # ----------------------------------------------------------------------------
@@ -49,8 +53,7 @@ chemical = 'CH3CHO'
 # Feedstocks
 # ----------------------------------------------------------------------------
 
-with open("data/feedstocks.json") as json_file:
-    fdata = json.load(json_file)
+fdata = load_fdata()
 
 feedstocks = [Feedstock(fd) for fd in fdata]
 
@@ -59,13 +62,11 @@ feedstocks = [Feedstock(fd) for fd in fdata]
 
 n = len(feedstocks)
 
-names = []
+names = [feedstock.name for feedstock in feedstocks]
 y_chemical = np.zeros(n)
 
 # Run batch reactor model for each feedstock
-for i in range(n):
-    feedstock = feedstocks[i]
-    names.append(feedstock.name)
+for i, feedstock in enumerate(feedstocks):
 
     # Calculate optimized biomass composition (daf) and splitting parameters
     bc, splits = feedstock.calc_biocomp()
@@ -75,28 +76,49 @@ for i in range(n):
     yh2o = feedstock.prox_ad[3] / 100
 
     # Perform batch reactor simulation
-    y0 = {'CELL': cell, 'GMSW': hemi, 'LIGC': ligc, 'LIGH': ligh, 'LIGO': ligo,
-          'TANN': tann, 'TGL': tgl, 'ACQUA': yh2o}
+    y0 = rct.get_y0(cti, [cell, hemi, ligc, ligh, ligo, tann, tgl, yh2o])
 
     states = rct.run_batch_simulation(cti, p, temp, time, y0, energy)
 
     y_chemical[i] = states(chemical).Y[-1]
     # y_chemical[i] = states(*chemical).Y.sum(axis=1)[-1]
 
+# Print
+# ----------------------------------------------------------------------------
+
+print(
+    f'\n{" Batch reactor model ":*^70}\n'
+    '\nParameters for reactor model\n'
+    f'final time    {time[-1]} s\n'
+    f'temperature   {temp} K\n'
+    f'pressure      {p:,} Pa\n'
+    f'energy        {energy}\n'
+    f'cti file      {cti}'
+)
+
+w = max(len(name) for name in names)
+
+print(f'\nFinal {label} mass fraction [-]')
+for i in range(n):
+    print(f'{names[i]:{w}}   {y_chemical[i]:.4f}')
+
 # Plot
 # ----------------------------------------------------------------------------
 
-y = np.arange(n)
+if args.plot:
+    import matplotlib.pyplot as plt
+
+    y = np.arange(n)
 
-_, ax = plt.subplots(tight_layout=True)
-ax.barh(y, y_chemical)
-ax.set_xlabel(f'{label}, mass fraction [-]')
-ax.set_yticks(y)
-ax.set_yticklabels(names)
-ax.invert_yaxis()
-ax.set_frame_on(False)
-ax.set_axisbelow(True)
-ax.tick_params(color='0.8')
-ax.xaxis.grid(True, color='0.8')
+    _, ax = plt.subplots(tight_layout=True)
+    ax.barh(y, y_chemical)
+    ax.set_xlabel(f'{label}, mass fraction [-]')
+    ax.set_yticks(y)
+    ax.set_yticklabels(names)
+    ax.invert_yaxis()
+    ax.set_frame_on(False)
+    ax.set_axisbelow(True)
+    ax.tick_params(color='0.8')
+    ax.xaxis.grid(True, color='0.8')
 
-plt.show()
+    save_or_show('run_batch_chemical', args.save)
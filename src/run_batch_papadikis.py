@@ -4,8 +4,13 @@ kinetics which includes primary and secondary reactions.
 """
 
 import cantera as ct
-import matplotlib.pyplot as plt
 import numpy as np
+from figures import parse_args, save_or_show
+
+# Command line options
+# ----------------------------------------------------------------------------
+
+args = parse_args()
 
 # Parameters
 # ----------------------------------------------------------------------------
@@ -37,35 +42,62 @@ for t in time:
     sim.advance(t)
     states.append(r.thermo.state, t=t)
 
-# Plot
+# Print
 # ----------------------------------------------------------------------------
 
-_, ax = plt.subplots(tight_layout=True)
-for i in range(len(feedstocks)):
-    ax.plot(states.t, states('wood').Y * rho[i], label=feedstocks[i])
-ax.set_xlabel('Time [s]')
-ax.set_ylabel('Wood concentration [kg/m³]')
-ax.grid(color='0.9')
-ax.set_frame_on(False)
-ax.tick_params(color='0.9')
-ax.legend(loc='best')
-
-_, ax = plt.subplots(tight_layout=True)
+print(
+    f'\n{" Batch reactor model ":*^70}\n'
+    '\nParameters for reactor model\n'
+    f'final time    {time[-1]} s\n'
+    f'temperature   {temp} K\n'
+    f'pressure      {p:,} Pa\n'
+    f'energy        {energy}\n'
+    f'cti file      {cti}'
+)
+
+print('\nFinal mass fractions [-]')
+for sp in y0:
+    print(f'{sp:6}  {states(sp).Y[-1, 0]:.4f}')
+
+w = max(len(name) for name in feedstocks)
+tar = states('tar').Y[-1, 0]
+
+print('\nFinal tar concentration [kg/m³]')
 for i in range(len(feedstocks)):
-    ax.plot(states.t, states('tar').Y * rho[i], label=feedstocks[i])
-ax.set_xlabel('Time [s]')
-ax.set_ylabel('Tar concentration [kg/m³]')
-ax.grid(color='0.9')
-ax.set_frame_on(False)
-ax.tick_params(color='0.9')
-ax.legend(loc='best')
-
-_, ax = plt.subplots(tight_layout=True)
-ax.plot(states.t, states('tar').Y)
-ax.set_xlabel('Time [s]')
-ax.set_ylabel('Tar mass fraction [-]')
-ax.grid(color='0.9')
-ax.set_frame_on(False)
-ax.tick_params(color='0.9')
-
-plt.show()
+    print(f'{feedstocks[i]:{w}}   {tar * rho[i]:.2f}')
+
+# Plot
+# ----------------------------------------------------------------------------
+
+if args.plot:
+    import matplotlib.pyplot as plt
+
+    _, ax = plt.subplots(tight_layout=True)
+    for i in range(len(feedstocks)):
+        ax.plot(states.t, states('wood').Y * rho[i], label=feedstocks[i])
+    ax.set_xlabel('Time [s]')
+    ax.set_ylabel('Wood concentration [kg/m³]')
+    ax.grid(color='0.9')
+    ax.set_frame_on(False)
+    ax.tick_params(color='0.9')
+    ax.legend(loc='best')
+
+    _, ax = plt.subplots(tight_layout=True)
+    for i in range(len(feedstocks)):
+        ax.plot(states.t, states('tar').Y * rho[i], label=feedstocks[i])
+    ax.set_xlabel('Time [s]')
+    ax.set_ylabel('Tar concentration [kg/m³]')
+    ax.grid(color='0.9')
+    ax.set_frame_on(False)
+    ax.tick_params(color='0.9')
+    ax.legend(loc='best')
+
+    _, ax = plt.subplots(tight_layout=True)
+    ax.plot(states.t, states('tar').Y)
+    ax.set_xlabel('Time [s]')
+    ax.set_ylabel('Tar mass fraction [-]')
+    ax.grid(color='0.9')
+    ax.set_frame_on(False)
+    ax.tick_params(color='0.9')
+
+    save_or_show('run_batch_papadikis', args.save)
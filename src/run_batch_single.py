@@ -17,11 +17,15 @@ A predictive model of biochar formation and characterization. Journal of
 Analytical and Applied Pyrolysis, vol. 134, pp. 326-335, 2018.
 """
 
-import json
-import matplotlib.pyplot as plt
 import numpy as np
 import reactor as rct
-from feedstock import Feedstock
+from feedstock import Feedstock, load_fdata
+from figures import parse_args, save_or_show
+
+# Command line options
+# ----------------------------------------------------------------------------
+
+args = parse_args()
 
 # Parameters
 # ----------------------------------------------------------------------------
@@ -36,8 +40,7 @@ cti = 'data/debiagi_sw_meta.cti'    # Cantera input file
 # Feedstock
 # ----------------------------------------------------------------------------
 
-with open("data/feedstocks.json") as json_file:
-    fdata = json.load(json_file)
+fdata = load_fdata()
 
 feedstock = Feedstock(fdata[0])     # change index to choose feedstock
 
@@ -54,8 +57,7 @@ yh2o = feedstock.prox_ad[3] / 100
 # Cantera batch reactor
 # ----------------------------------------------------------------------------
 
-y0 = {'CELL': cell, 'GMSW': hemi, 'LIGC': ligc, 'LIGH': ligh, 'LIGO': ligo,
-      'TANN': tann, 'TGL': tgl, 'ACQUA': yh2o}
+y0 = rct.get_y0(cti, [cell, hemi, ligc, ligh, ligo, tann, tgl, yh2o])
 
 states = rct.run_batch_simulation(cti, p, temp, time, y0, energy)
 
@@ -65,11 +67,11 @@ sp_liquids = rct.sp_liquids
 sp_solids = rct.sp_solids
 sp_metaplastics = rct.sp_metaplastics
 
+# Mass fractions of all species at each time step
+y_species = states.Y
+
 # Mass fractions of the phases at each time step
-y_gas = states(*sp_gases).Y.sum(axis=1)
-y_liquid = states(*sp_liquids).Y.sum(axis=1)
-y_solid = states(*sp_solids).Y.sum(axis=1)
-y_metaplastic = states(*sp_metaplastics).Y.sum(axis=1)
+y_gas, y_liquid, y_solid, y_metaplastic = rct.get_yphases(states)
 
 # Carbon, hydrogen, and oxygen fractions
 yc_gases, yh_gases, yo_gases = rct.get_ycho_gases(states)
@@ -123,134 +125,136 @@ print(
 print(
     '\nFinal mixture CHO fractions\n'
     '       gas   liquid\n'
-    f'yc    {yc_gases.sum(axis=1)[-1]:.2f}     {yc_liquids.sum(axis=1)[-1]:.2f}\n'
-    f'yh    {yh_gases.sum(axis=1)[-1]:.2f}     {yh_liquids.sum(axis=1)[-1]:.2f}\n'
-    f'yo    {yo_gases.sum(axis=1)[-1]:.2f}     {yo_liquids.sum(axis=1)[-1]:.2f}'
+    f'yc    {yc_gases[-1]:.2f}     {yc_liquids[-1]:.2f}\n'
+    f'yh    {yh_gases[-1]:.2f}     {yh_liquids[-1]:.2f}\n'
+    f'yo    {yo_gases[-1]:.2f}     {yo_liquids[-1]:.2f}'
 )
 
 
 # Plot
 # ----------------------------------------------------------------------------
 
-def style(ax, xlabel, ylabel, loc=None):
-    ax.grid(color='0.9')
+if args.plot:
+    import matplotlib.pyplot as plt
+
+    def style(ax, xlabel, ylabel, loc=None):
+        ax.grid(color='0.9')
+        ax.set_frame_on(False)
+        ax.tick_params(color='0.9')
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        if loc:
+            ax.legend(loc=loc)
+        # plt.rcParams.update({'font.size': 13, 'lines.linewidth': 2})
+
+    # ---
+
+    _, ax = plt.subplots()
+    ax.plot(states.t, yc_gases, label='carbon')
+    ax.plot(states.t, yh_gases, label='hydrogen')
+    ax.plot(states.t, yo_gases, label='oxygen')
+    style(ax, xlabel='Time [s]', ylabel='Gas mixture CHO fractions [-]', loc='best')
+
+    # ---
+
+    _, ax = plt.subplots()
+    ax.plot(states.t, yc_liquids, label='carbon')
+    ax.plot(states.t, yh_liquids, label='hydrogen')
+    ax.plot(states.t, yo_liquids, label='oxygen')
+    style(ax, xlabel='Time [s]', ylabel='Liquid mixture CHO fractions [-]', loc='best')
+
+    # ---
+
+    fig, ax = plt.subplots(tight_layout=True)
+    ax.plot(states.t, y_species[:, states.species_index('CELL')], label='CELL')
+    ax.plot(states.t, y_species[:, states.species_index('GMSW')], label='GMSW')
+    # ax.plot(states.t, y_species[:, states.species_index('XYHW')], label='XYHW')
+    # ax.plot(states.t, y_species[:, states.species_index('XYGR')], label='XYGR')
+    ax.plot(states.t, y_species[:, states.species_index('LIGC')], label='LIGC')
+    ax.plot(states.t, y_species[:, states.species_index('LIGH')], label='LIGH')
+    ax.plot(states.t, y_species[:, states.species_index('LIGO')], label='LIGO')
+    ax.plot(states.t, y_species[:, states.species_index('TANN')], label='TANN')
+    ax.plot(states.t, y_species[:, states.species_index('TGL')], label='TGL')
+    style(ax, xlabel='Time [s]', ylabel='Mass fraction [-]', loc='best')
+
+    # ---
+
+    fig, ax = plt.subplots(tight_layout=True)
+    ax.plot(states.t, y_species[:, states.species_index('CELLA')], label='CELLA')
+    ax.plot(states.t, y_species[:, states.species_index('HCE1')], label='HCE1')
+    ax.plot(states.t, y_species[:, states.species_index('HCE2')], label='HCE2')
+    ax.plot(states.t, y_species[:, states.species_index('LIGCC')], label='LIGCC')
+    ax.plot(states.t, y_species[:, states.species_index('LIGOH')], label='LIGOH')
+    ax.plot(states.t, y_species[:, states.species_index('LIG')], label='LIG')
+    style(ax, xlabel='Time [s]', ylabel='Mass fraction [-]', loc='best')
+
+    # ---
+
+    _, ax = plt.subplots(tight_layout=True)
+    ax.plot(states.t, y_gas, label='gas')
+    ax.plot(states.t, y_liquid, label='liquid')
+    ax.plot(states.t, y_solid, label='solid')
+    ax.plot(states.t, y_metaplastic, label='metaplastic')
+    style(ax, xlabel='Time [s]', ylabel='Mass fraction [-]', loc='best')
+
+    # ---
+
+    _, ax = plt.subplots(tight_layout=True)
+    ax.plot(states.t, states.T, color='m')
+    style(ax, xlabel='Time [s]', ylabel='Temperature [K]')
+
+    # ---
+
+    y_gas = np.arange(len(sp_gases))
+    x_gas = y_species[-1, rct.get_species_indices(states, sp_gases)]
+
+    y_liquid = np.arange(len(sp_liquids))
+    x_liquid = y_species[-1, rct.get_species_indices(states, sp_liquids)]
+
+    y_solid = np.arange(len(sp_solids))
+    x_solid = y_species[-1, rct.get_species_indices(states, sp_solids)]
+
+    y_meta = np.arange(len(sp_metaplastics))
+    x_meta = y_species[-1, rct.get_species_indices(states, sp_metaplastics)]
+
+    _, ax = plt.subplots(tight_layout=True)
+    ax.barh(y_gas, x_gas, color='C6')
+    ax.set_xlabel('Gas species mass fraction [-]')
+    ax.set_yticks(y_gas)
+    ax.set_yticklabels(list(sp_gases))
     ax.set_frame_on(False)
-    ax.tick_params(color='0.9')
-    ax.set_xlabel(xlabel)
-    ax.set_ylabel(ylabel)
-    if loc:
-        ax.legend(loc=loc)
-    # plt.rcParams.update({'font.size': 13, 'lines.linewidth': 2})
-
-
-# ---
-
-_, ax = plt.subplots()
-ax.plot(states.t, yc_gases.sum(axis=1), label='carbon')
-ax.plot(states.t, yh_gases.sum(axis=1), label='hydrogen')
-ax.plot(states.t, yo_gases.sum(axis=1), label='oxygen')
-style(ax, xlabel='Time [s]', ylabel='Gas mixture CHO fractions [-]', loc='best')
-
-# ---
-
-_, ax = plt.subplots()
-ax.plot(states.t, yc_liquids.sum(axis=1), label='carbon')
-ax.plot(states.t, yh_liquids.sum(axis=1), label='hydrogen')
-ax.plot(states.t, yo_liquids.sum(axis=1), label='oxygen')
-style(ax, xlabel='Time [s]', ylabel='Liquid mixture CHO fractions [-]', loc='best')
-
-# ---
-
-fig, ax = plt.subplots(tight_layout=True)
-ax.plot(states.t, states('CELL').Y[:, 0], label='CELL')
-ax.plot(states.t, states('GMSW').Y[:, 0], label='GMSW')
-# ax.plot(states.t, states('XYHW').Y[:, 0], label='XYHW')
-# ax.plot(states.t, states('XYGR').Y[:, 0], label='XYGR')
-ax.plot(states.t, states('LIGC').Y[:, 0], label='LIGC')
-ax.plot(states.t, states('LIGH').Y[:, 0], label='LIGH')
-ax.plot(states.t, states('LIGO').Y[:, 0], label='LIGO')
-ax.plot(states.t, states('TANN').Y[:, 0], label='TANN')
-ax.plot(states.t, states('TGL').Y[:, 0], label='TGL')
-style(ax, xlabel='Time [s]', ylabel='Mass fraction [-]', loc='best')
-
-# ---
-
-fig, ax = plt.subplots(tight_layout=True)
-ax.plot(states.t, states('CELLA').Y[:, 0], label='CELLA')
-ax.plot(states.t, states('HCE1').Y[:, 0], label='HCE1')
-ax.plot(states.t, states('HCE2').Y[:, 0], label='HCE2')
-ax.plot(states.t, states('LIGCC').Y[:, 0], label='LIGCC')
-ax.plot(states.t, states('LIGOH').Y[:, 0], label='LIGOH')
-ax.plot(states.t, states('LIG').Y[:, 0], label='LIG')
-style(ax, xlabel='Time [s]', ylabel='Mass fraction [-]', loc='best')
-
-# ---
-
-_, ax = plt.subplots(tight_layout=True)
-ax.plot(states.t, y_gas, label='gas')
-ax.plot(states.t, y_liquid, label='liquid')
-ax.plot(states.t, y_solid, label='solid')
-ax.plot(states.t, y_metaplastic, label='metaplastic')
-style(ax, xlabel='Time [s]', ylabel='Mass fraction [-]', loc='best')
-
-# ---
-
-_, ax = plt.subplots(tight_layout=True)
-ax.plot(states.t, states.T, color='m')
-style(ax, xlabel='Time [s]', ylabel='Temperature [K]')
-
-# ---
-
-y_gas = np.arange(len(sp_gases))
-x_gas = states(*sp_gases).Y[-1]
-
-y_liquid = np.arange(len(sp_liquids))
-x_liquid = states(*sp_liquids).Y[-1]
-
-y_solid = np.arange(len(sp_solids))
-x_solid = states(*sp_solids).Y[-1]
-
-y_meta = np.arange(len(sp_metaplastics))
-x_meta = states(*sp_metaplastics).Y[-1]
-
-_, ax = plt.subplots(tight_layout=True)
-ax.barh(y_gas, x_gas, color='C6')
-ax.set_xlabel('Gas species mass fraction [-]')
-ax.set_yticks(y_gas)
-ax.set_yticklabels(list(sp_gases))
-ax.set_frame_on(False)
-ax.set_axisbelow(True)
-ax.tick_params(color='0.8')
-ax.xaxis.grid(True, color='0.8')
-
-_, ax = plt.subplots(tight_layout=True)
-ax.barh(y_liquid, x_liquid, color='C4')
-ax.set_xlabel('Liquid species mass fraction [-]')
-ax.set_yticks(y_liquid)
-ax.set_yticklabels(list(sp_liquids))
-ax.set_frame_on(False)
-ax.set_axisbelow(True)
-ax.tick_params(color='0.8')
-ax.xaxis.grid(True, color='0.8')
-
-_, ax = plt.subplots(tight_layout=True)
-ax.barh(y_solid, x_solid, color='C2')
-ax.set_xlabel('Solid species mass fraction [-]')
-ax.set_yticks(y_solid)
-ax.set_yticklabels(list(sp_solids))
-ax.set_frame_on(False)
-ax.set_axisbelow(True)
-ax.tick_params(color='0.8')
-ax.xaxis.grid(True, color='0.8')
-
-_, ax = plt.subplots(tight_layout=True)
-ax.barh(y_meta, x_meta, color='C1')
-ax.set_xlabel('Metaplastic species mass fraction [-]')
-ax.set_yticks(y_meta)
-ax.set_yticklabels(list(sp_metaplastics))
-ax.set_frame_on(False)
-ax.set_axisbelow(True)
-ax.tick_params(color='0.8')
-ax.xaxis.grid(True, color='0.8')
-
-plt.show()
+    ax.set_axisbelow(True)
+    ax.tick_params(color='0.8')
+    ax.xaxis.grid(True, color='0.8')
+
+    _, ax = plt.subplots(tight_layout=True)
+    ax.barh(y_liquid, x_liquid, color='C4')
+    ax.set_xlabel('Liquid species mass fraction [-]')
+    ax.set_yticks(y_liquid)
+    ax.set_yticklabels(list(sp_liquids))
+    ax.set_frame_on(False)
+    ax.set_axisbelow(True)
+    ax.tick_params(color='0.8')
+    ax.xaxis.grid(True, color='0.8')
+
+    _, ax = plt.subplots(tight_layout=True)
+    ax.barh(y_solid, x_solid, color='C2')
+    ax.set_xlabel('Solid species mass fraction [-]')
+    ax.set_yticks(y_solid)
+    ax.set_yticklabels(list(sp_solids))
+    ax.set_frame_on(False)
+    ax.set_axisbelow(True)
+    ax.tick_params(color='0.8')
+    ax.xaxis.grid(True, color='0.8')
+
+    _, ax = plt.subplots(tight_layout=True)
+    ax.barh(y_meta, x_meta, color='C1')
+    ax.set_xlabel('Metaplastic species mass fraction [-]')
+    ax.set_yticks(y_meta)
+    ax.set_yticklabels(list(sp_metaplastics))
+    ax.set_frame_on(False)
+    ax.set_axisbelow(True)
+    ax.tick_params(color='0.8')
+    ax.xaxis.grid(True, color='0.8')
+
+    save_or_show('run_batch_single', args.save)
@@ -15,11 +15,12 @@ A predictive model of biochar formation and characterization. Journal of
 Analytical and Applied Pyrolysis, vol. 134, pp. 326-335, 2018.
 """
 
-import json
-import matplotlib.pyplot as plt
 import numpy as np
 import reactor as rct
-from feedstock import Feedstock
+from concurrent.futures import ProcessPoolExecutor
+from feedstock import Feedstock, load_fdata
+from figures import parse_args, save_or_show
+from itertools import repeat
 
 # Parameters
 # ----------------------------------------------------------------------------
@@ -31,98 +32,116 @@ time = np.linspace(0, 20.0, 100)            # reaction time steps [s]
 energy = 'off'                      # reactor energy
 cti = 'data/debiagi_sw_meta.cti'    # Cantera input file
 
-# Feedstock
+# Cantera batch reactor
 # ----------------------------------------------------------------------------
 
-with open("data/feedstocks.json") as json_file:
-    fdata = json.load(json_file)
 
-feedstock = Feedstock(fdata[0])     # change index to choose feedstock
+def simulate_temp(temp, y0):
+    """
+    Run the batch reactor model at a temperature and return the mass
+    fractions of the phases at each time step.
+    """
+    # Mass fractions of the phases at each time step for a defined temperature
+    y_gas, y_liquid, y_solid, y_metaplastic = rct.run_batch_yphases(cti, p, temp, time, y0, energy)
 
-# Biomass composition
-# ----------------------------------------------------------------------------
+    return y_gas, y_liquid, y_solid, y_metaplastic
 
-# Calculate optimized biomass composition (daf) and splitting parameters
-bc, splits = feedstock.calc_biocomp()
-cell, hemi, ligc, ligh, ligo, tann, tgl = bc['y_daf']
 
-# Cantera batch reactor
-# ----------------------------------------------------------------------------
+if __name__ == '__main__':
 
-# Store results for each tempature
-ntemps = len(temps)
-ntime = len(time)
-yt_gas = np.zeros((ntemps, ntime))
-yt_liquid = np.zeros((ntemps, ntime))
-yt_solid = np.zeros((ntemps, ntime))
-yt_metaplastic = np.zeros((ntemps, ntime))
+    # Command line options
+    # ------------------------------------------------------------------------
 
-# Chemical species representing each phase
-sp_gases = rct.sp_gases
-sp_liquids = rct.sp_liquids
-sp_solids = rct.sp_solids
-sp_metaplastics = rct.sp_metaplastics
+    args = parse_args()
 
-# Get feedstock moisture content as mass fraction
-y0_h2o = feedstock.prox_ad[3] / 100
+    # Feedstock
+    # ------------------------------------------------------------------------
 
-y0 = {'CELL': cell, 'GMSW': hemi, 'LIGC': ligc, 'LIGH': ligh, 'LIGO': ligo,
-      'TANN': tann, 'TGL': tgl, 'ACQUA': y0_h2o}
+    fdata = load_fdata()
 
-for i in range(ntemps):
-    temp = temps[i]
-    states = rct.run_batch_simulation(cti, p, temp, time, y0, energy)
+    feedstock = Feedstock(fdata[0])     # change index to choose feedstock
 
-    # Mass fractions of the phases at each time step for a defined temperature
-    yt_gas[i] = states(*sp_gases).Y.sum(axis=1)
-    yt_liquid[i] = states(*sp_liquids).Y.sum(axis=1)
-    yt_solid[i] = states(*sp_solids).Y.sum(axis=1)
-    yt_metaplastic[i] = states(*sp_metaplastics).Y.sum(axis=1)
+    # Biomass composition
+    # ------------------------------------------------------------------------
 
-# Print
-# ----------------------------------------------------------------------------
+    # Calculate optimized biomass composition (daf) and splitting parameters
+    bc, splits = feedstock.calc_biocomp()
+    cell, hemi, ligc, ligh, ligo, tann, tgl = bc['y_daf']
 
-print(
-    f'\n{" Batch reactor model ":*^70}\n'
-    '\nParameters for reactor model\n'
-    f'feedstock     {feedstock.name + ", Cycle " + str(feedstock.cycle)}\n'
-    f'final time    {time[-1]} s\n'
-    f'temperature   {temp} K\n'
-    f'pressure      {p:,} Pa\n'
-    f'energy        {energy}\n'
-    f'cti file      {cti}'
-)
-
-# Plot
-# ----------------------------------------------------------------------------
+    # Get feedstock moisture content as mass fraction
+    y0_h2o = feedstock.prox_ad[3] / 100
+
+    y0 = rct.get_y0(cti, [cell, hemi, ligc, ligh, ligo, tann, tgl, y0_h2o])
+
+    # Run batch reactor model for each temperature in parallel
+    # ------------------------------------------------------------------------
+
+    ntemps = len(temps)
+
+    # The mechanism was loaded by `get_y0` above so forked worker processes
+    # inherit it instead of parsing the Cantera input file again
+    with ProcessPoolExecutor(mp_context=rct.get_mp_context()) as executor:
+        results = list(executor.map(simulate_temp, temps, repeat(y0)))
+
+    # Store results for each tempature where each row is a temperature and
+    # each column is a time step
+    yt_gas, yt_liquid, yt_solid, yt_metaplastic = np.array(results).transpose(1, 0, 2)
+
+    # Print
+    # ------------------------------------------------------------------------
+
+    print(
+        f'\n{" Batch reactor model ":*^70}\n'
+        '\nParameters for reactor model\n'
+        f'feedstock     {feedstock.name + ", Cycle " + str(feedstock.cycle)}\n'
+        f'final time    {time[-1]} s\n'
+        f'temperatures  {temps} K\n'
+        f'pressure      {p:,} Pa\n'
+        f'energy        {energy}\n'
+        f'cti file      {cti}'
+    )
+
+    print(
+        '\nFinal yields, wt. ％\n'
+        f'{"temp [K]":>8}   {"gas":>6} {"liquid":>6} {"solid":>6} {"meta":>6}'
+    )
+    for i in range(ntemps):
+        print(
+            f'{temps[i]:8.2f}   {yt_gas[i, -1] * 100:6.2f} {yt_liquid[i, -1] * 100:6.2f} '
+            f'{yt_solid[i, -1] * 100:6.2f} {yt_metaplastic[i, -1] * 100:6.2f}'
+        )
 
+    # Plot
+    # ------------------------------------------------------------------------
 
-def style(ax, xlabel, ylabel, loc=None, title=None):
-    ax.grid(color='0.9')
-    ax.set_frame_on(False)
-    ax.tick_params(color='0.9')
-    ax.set_xlabel(xlabel)
-    ax.set_ylabel(ylabel)
-    if loc:
-        ax.legend(loc=loc)
-    if title:
-        ax.set_title(title)
+    if args.plot:
+        import matplotlib.pyplot as plt
 
+        def style(ax, xlabel, ylabel, loc=None, title=None):
+            ax.grid(color='0.9')
+            ax.set_frame_on(False)
+            ax.tick_params(color='0.9')
+            ax.set_xlabel(xlabel)
+            ax.set_ylabel(ylabel)
+            if loc:
+                ax.legend(loc=loc)
+            if title:
+                ax.set_title(title)
 
-_, (ax1, ax2, ax3) = plt.subplots(nrows=1, ncols=3, figsize=(8, 4.8), sharey=True, tight_layout=True)
+        _, (ax1, ax2, ax3) = plt.subplots(nrows=1, ncols=3, figsize=(8, 4.8), sharey=True, tight_layout=True)
 
-for i in range(ntemps):
-    if temps[i] == 773.15:
-        ax1.plot(time, yt_gas[i], 'k--')
-        ax2.plot(time, yt_liquid[i], 'k--')
-        ax3.plot(time, yt_solid[i] + yt_metaplastic[i], 'k--', label=f'{temps[i]} K')
-    else:
-        ax1.plot(time, yt_gas[i])
-        ax2.plot(time, yt_liquid[i])
-        ax3.plot(time, yt_solid[i] + yt_metaplastic[i], label=f'{temps[i]} K')
+        for i in range(ntemps):
+            if temps[i] == 773.15:
+                ax1.plot(time, yt_gas[i], 'k--')
+                ax2.plot(time, yt_liquid[i], 'k--')
+                ax3.plot(time, yt_solid[i] + yt_metaplastic[i], 'k--', label=f'{temps[i]} K')
+            else:
+                ax1.plot(time, yt_gas[i])
+                ax2.plot(time, yt_liquid[i])
+                ax3.plot(time, yt_solid[i] + yt_metaplastic[i], label=f'{temps[i]} K')
 
-style(ax1, 'Time [s]', 'Mass fraction [-]', title='Gases')
-style(ax2, 'Time [s]', '', title='Liquids')
-style(ax3, 'Time [s]', '', loc='best', title='Solids')
+        style(ax1, 'Time [s]', 'Mass fraction [-]', title='Gases')
+        style(ax2, 'Time [s]', '', title='Liquids')
+        style(ax3, 'Time [s]', '', loc='best', title='Solids')
 
-plt.show()
+        save_or_show('run_batch_temps', args.save)
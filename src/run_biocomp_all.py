@@ -5,14 +5,12 @@ obtained using an optimization function which compares the results to the
 measured chemical analysis data.
 """
 
-import json
-from feedstock import Feedstock
+from feedstock import Feedstock, load_fdata
 
 # Feedstock
 # ----------------------------------------------------------------------------
 
-with open("data/feedstocks.json") as json_file:
-    fdata = json.load(json_file)
+fdata = load_fdata()
 
 feedstocks = [Feedstock(fd) for fd in fdata]
 
@@ -6,15 +6,18 @@ measured chemical analysis data.
 """
 
 import chemics as cm
-import json
-import matplotlib.pyplot as plt
-from feedstock import Feedstock
+from feedstock import Feedstock, load_fdata
+from figures import parse_args, save_or_show
+
+# Command line options
+# ----------------------------------------------------------------------------
+
+args = parse_args()
 
 # Feedstock
 # ----------------------------------------------------------------------------
 
-with open("data/feedstocks.json") as json_file:
-    fdata = json.load(json_file)
+fdata = load_fdata()
 
 feedstock = Feedstock(fdata[0])  # change index to select a feedstock
 
@@ -58,8 +61,11 @@ print(
 # Plot
 # ----------------------------------------------------------------------------
 
-fig, ax = plt.subplots(tight_layout=True)
-cm.plot_biocomp(ax, yc, yh, bc['y_rm1'], bc['y_rm2'], bc['y_rm3'])
-ax.set_title(feedstock.name, y=1, pad=-16)
+if args.plot:
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(tight_layout=True)
+    cm.plot_biocomp(ax, yc, yh, bc['y_rm1'], bc['y_rm2'], bc['y_rm3'])
+    ax.set_title(feedstock.name, y=1, pad=-16)
 
-plt.show()
+    save_or_show('run_biocomp_single', args.save)
@@ -6,18 +6,21 @@ as-determined values for each feedstock
 
 # FIX: need to get chemical analysis data for cycle 15 and cycle 16, last two feedstocks
 
-import json
-import matplotlib.pyplot as plt
 import numpy as np
-from feedstock import Feedstock
+from feedstock import Feedstock, load_fdata
+from figures import parse_args, save_or_show
 
 np.set_printoptions(precision=4, suppress=True)
 
+# Command line options
+# ----------------------------------------------------------------------------
+
+args = parse_args()
+
 # Feedstock
 # ----------------------------------------------------------------------------
 
-with open("data/feedstocks.json") as json_file:
-    fdata = json.load(json_file)
+fdata = load_fdata()
 
 feedstocks = [Feedstock(fd) for fd in fdata]
 
@@ -32,9 +35,9 @@ for i, f in enumerate(feedstocks):
     chem_daf = f.chem_daf
     biocomp = f.chem_bc
 
-    total_d = sum(f.chem_d)
-    total_daf = sum(chem_daf)
-    total_bio = sum(biocomp)
+    total_d = f.chem_d.sum()
+    total_daf = chem_daf.sum()
+    total_bio = biocomp.sum()
 
     print(f'\n{" " + f.name + ", Cycle " + str(f.cycle) + " ":*^70}\n')
     print(
@@ -85,26 +88,27 @@ print(
 # Plot
 # ----------------------------------------------------------------------------
 
-def style(ax):
-    ax.grid(color='0.9')
-    ax.set_frame_on(False)
-    ax.tick_params(color='0.9')
+if args.plot:
+    import matplotlib.pyplot as plt
 
+    def style(ax):
+        ax.grid(color='0.9')
+        ax.set_frame_on(False)
+        ax.tick_params(color='0.9')
 
-labels = [
-    'struct. inorg.', 'non-struct. inorg.', 'water ext.', 'ethanol ext.', 'acetone ext.',
-    'lignin', 'glucan', 'xylan', 'galactan', 'arabinan', 'mannan', 'acetyl'
-]
+    labels = [
+        'struct. inorg.', 'non-struct. inorg.', 'water ext.', 'ethanol ext.', 'acetone ext.',
+        'lignin', 'glucan', 'xylan', 'galactan', 'arabinan', 'mannan', 'acetyl'
+    ]
 
-_, ax = plt.subplots(tight_layout=True)
+    _, ax = plt.subplots(tight_layout=True)
 
-for c in chems_d:
-    ax.plot(c, 'o')
-ax.set_ylabel('Weight % (dry basis)')
-ax.set_xlabel('Chemical analysis')
-ax.set_xticks(range(len(labels)))
-ax.set_xticklabels(labels)
-ax.tick_params(axis='x', rotation=90)
-style(ax)
+    ax.plot(np.arange(12), chems_d.T, 'o')
+    ax.set_ylabel('Weight % (dry basis)')
+    ax.set_xlabel('Chemical analysis')
+    ax.set_xticks(range(len(labels)))
+    ax.set_xticklabels(labels)
+    ax.tick_params(axis='x', rotation=90)
+    style(ax)
 
-plt.show()
+    save_or_show('run_chem_analysis', args.save)
@@ -19,12 +19,12 @@ Analytical and Applied Pyrolysis, vol. 134, pp. 326-335, 2018.
 """
 
 import cantera as ct
-import chemics as cm
-import json
-import matplotlib.pyplot as plt
 import numpy as np
 import reactor as rct
-from feedstock import Feedstock
+from concurrent.futures import ProcessPoolExecutor
+from feedstock import Feedstock, load_fdata
+from figures import parse_args, save_or_show
+from inputs import calc_feed
 
 # Disable warnings about discontinuity at polynomial mid-point in thermo data.
 # Remove this line to show the warnings.
@@ -45,59 +45,32 @@ n_cstrs = 1000                      # number of CSTRs in series
 energy = 'off'                      # reactor energy
 cti = 'data/debiagi_sw_metan2.cti'  # Cantera input file
 
-# Feedstocks
-# ----------------------------------------------------------------------------
-
-with open("data/feedstocks.json") as json_file:
-    fdata = json.load(json_file)
-
-# only use feedstocks with residence time value
-feedstocks = [Feedstock(fd) for fd in fdata if 'residenceTime' in fd]
-
 # Reactor inputs
 # ----------------------------------------------------------------------------
 
-# Convert biomass feedrate from g/hr to kg/s
-mf_bio = ghr_bio / 1000 / 3600
-
-# Convert nitrogen gas flowrate from SLM to kg/s
-# 1 m³/s = 60,000 liter/minute
-# N₂ gas molecular weight = 28 g/mol
-# N₂ gas density at STP = 1.2506 kg/m³
-lpm_n2 = cm.slm_to_lpm(slm_n2, p / 1000, temp)
-rhog_n2 = cm.rhog(28, 101325, 773.15)
-mf_n2 = lpm_n2 / 60_000 * rhog_n2
-
-# Mass fraction of nitrogen gas into reactor
-y0_n2 = mf_n2 / (mf_n2 + mf_bio)
+# Biomass and nitrogen gas mass flow rates [kg/s] and mass fraction of
+# nitrogen gas into reactor
+mf_bio, mf_n2, y0_n2 = calc_feed(ghr_bio, slm_n2, p, temp)
 
 # Cantera CSTR model
 # ----------------------------------------------------------------------------
 
-# Store results for each feedstock
-names = []
-nf = len(feedstocks)
-
-yf_gases = np.zeros(nf)
-yf_liquids = np.zeros(nf)
-yf_solids = np.zeros(nf)
-yf_metas = np.zeros(nf)
-
-ycf_gas = np.zeros(nf)
-yhf_gas = np.zeros(nf)
-yof_gas = np.zeros(nf)
-
-ycf_liquid = np.zeros(nf)
-yhf_liquid = np.zeros(nf)
-yof_liquid = np.zeros(nf)
-
-exp_gases = np.zeros(nf)
-exp_liquids = np.zeros(nf)
-exp_solids = np.zeros(nf)
-exp_ash = np.zeros(nf)
-
-# Run CSTR reactor model for each feedstock
-for i, feedstock in enumerate(feedstocks):
+# Fields of the results record returned for each feedstock
+results_dtype = np.dtype([
+    ('yf_gases', 'f8'), ('yf_liquids', 'f8'), ('yf_solids', 'f8'), ('yf_metas', 'f8'),
+    ('ycf_gas', 'f8'), ('yhf_gas', 'f8'), ('yof_gas', 'f8'),
+    ('ycf_liquid', 'f8'), ('yhf_liquid', 'f8'), ('yof_liquid', 'f8'),
+    ('exp_gases', 'f8'), ('exp_liquids', 'f8'), ('exp_solids', 'f8'), ('exp_ash', 'f8')
+])
+
+
+def simulate_feedstock(i, fd):
+    """
+    Run the series of CSTR models for a feedstock. Only the exit yields and
+    CHO fractions are returned so the results are cheap to send back from a
+    worker process.
+    """
+    feedstock = Feedstock(fd)
     print('Run', i, feedstock.name)
 
     # Get residence time for each CSTR
@@ -118,203 +91,244 @@ for i, feedstock in enumerate(feedstocks):
     states = rct.run_cstr_simulation(cti, diam, length, n_cstrs, p, tau, temp, y0, energy)
 
     # Mass fractions of phases and nitrogen gas in each CSTR (N₂ basis)
-    y_n2 = states('N2').Y[:, 0]
-    y_gas_n2 = states(*rct.sp_gases_n2).Y.sum(axis=1)
-    y_liquid_n2 = states(*rct.sp_liquids).Y.sum(axis=1)
-    y_solid_n2 = states(*rct.sp_solids).Y.sum(axis=1)
-    y_metaplastic_n2 = states(*rct.sp_metaplastics).Y.sum(axis=1)
+    y_gas_n2, y_liquid_n2, y_solid_n2, y_metaplastic_n2, y_n2 = rct.get_yphases_n2(states)
 
     # Mass fractions of the phases excluding nitrogen gas in each CSTR (N₂ free basis)
-    sum_no_n2 = y_gas_n2 + y_liquid_n2 + y_solid_n2 + y_metaplastic_n2 - y_n2
-    y_gas = (y_gas_n2 - y_n2) / sum_no_n2
-    y_liquid = y_liquid_n2 / sum_no_n2
-    y_solid = y_solid_n2 / sum_no_n2
-    y_metaplastic = y_metaplastic_n2 / sum_no_n2
+    y_gas, y_liquid, y_solid, y_metaplastic = rct.n2_free_basis(y_gas_n2, y_liquid_n2, y_solid_n2, y_metaplastic_n2, y_n2)
 
-    # Carbon, hydrogen, and oxygen fractions in gas phase (N₂ basis)
+    # Carbon, hydrogen, and oxygen fractions in gas and liquid phases (N₂ basis)
     yc_gases, yh_gases, yo_gases = rct.get_ycho_gases(states)
-    ycf_gas[i] = yc_gases.sum(axis=1)[-1]
-    yhf_gas[i] = yh_gases.sum(axis=1)[-1]
-    yof_gas[i] = yo_gases.sum(axis=1)[-1]
-
-    # Carbon, hydrogen, and oxygen fractions in liquid phase (N₂ basis)
     yc_liquids, yh_liquids, yo_liquids = rct.get_ycho_liquids(states)
-    ycf_liquid[i] = yc_liquids.sum(axis=1)[-1]
-    yhf_liquid[i] = yh_liquids.sum(axis=1)[-1]
-    yof_liquid[i] = yo_liquids.sum(axis=1)[-1]
-
-    # Store exit yields for feedstock
-    names.append(feedstock.name)
-    yf_gases[i] = y_gas[-1]
-    yf_liquids[i] = y_liquid[-1]
-    yf_solids[i] = y_solid[-1]
-    yf_metas[i] = y_metaplastic[-1]
 
     # Experiment lumped yields
-    exp_gases[i] = feedstock.lump2_yield[0]
-    exp_liquids[i] = feedstock.lump2_yield[1]
-    exp_solids[i] = feedstock.lump2_yield[2]
-    exp_ash[i] = feedstock.prox_ad[2]
-
-# Print
-# ----------------------------------------------------------------------------
-
-print(f'\n{" CSTR model ":*^70}\n')
-
-print(
-    'Parameters for reactor model\n'
-    f'diam       {diam} m\n'
-    f'length     {length} m\n'
-    f'temp       {temp} K\n'
-    f'p          {p:,} Pa\n'
-    f'n_cstrs    {n_cstrs}\n'
-    f'energy     {energy}\n'
-    f'cti file   {cti}'
-)
-
-
-# Plot
-# ----------------------------------------------------------------------------
-
-def style_barh(ax):
-    ax.invert_yaxis()
-    ax.set_axisbelow(True)
-    ax.set_frame_on(False)
-    ax.tick_params(color='0.8')
-    ax.xaxis.grid(True, color='0.8')
-
-
-y = np.arange(nf)
-
-_, ax = plt.subplots(tight_layout=True, figsize=(9, 4.8))
-b1 = ax.barh(y, yf_gases * 100, color='C6', label='Gases')
-b2 = ax.barh(y, yf_liquids * 100, left=yf_gases * 100, color='C4', label='Liquids')
-b3 = ax.barh(y, yf_solids * 100, left=(yf_gases + yf_liquids) * 100, color='C2', label='Solids')
-b4 = ax.barh(y, yf_metas * 100, left=(yf_gases + yf_liquids + yf_solids) * 100, color='C1', label='Metaplastics')
-ax.bar_label(b1, color='w', label_type='center', fmt='%.1f')
-ax.bar_label(b2, color='w', label_type='center', fmt='%.1f')
-ax.bar_label(b3, color='w', label_type='center', fmt='%.1f')
-ax.bar_label(b4, color='w', label_type='center', fmt='%.1f')
-ax.legend(bbox_to_anchor=[0.5, 1.02], loc='center', ncol=4, frameon=False)
-ax.set_yticks(y)
-ax.set_yticklabels(names)
-ax.set_xlabel('Final yield [wt. %]')
-style_barh(ax)
-
-# ---
-
-h = 0.4
-yf_gases = yf_gases * 100
-yf_liquids = yf_liquids * 100
-yf_solids = yf_solids * 100
-yf_metas = yf_metas * 100
-yf_solidmeta = yf_solids + yf_metas
-
-_, ax = plt.subplots(tight_layout=True, figsize=(9, 4.8))
-
-b1 = ax.barh(y, yf_gases, edgecolor='k', height=h, color='C6', label='Gases')
-b2 = ax.barh(y, yf_liquids, edgecolor='k', left=yf_gases, height=h, color='C4', label='Liquids')
-b3 = ax.barh(y, yf_solidmeta, edgecolor='k', left=yf_gases + yf_liquids, height=h, color='C2', label='Solids')
-
-e1 = ax.barh(y + h, exp_gases, edgecolor='k', height=h, color='C6')
-e2 = ax.barh(y + h, exp_liquids, edgecolor='k', height=h, left=exp_gases, color='C4')
-e3 = ax.barh(y + h, exp_solids, edgecolor='k', height=h, left=exp_gases + exp_liquids, color='C2')
-
-ax.bar_label(b1, color='w', label_type='center', fmt='%.1f')
-ax.bar_label(e1, color='w', label_type='center', fmt='%.1f')
-ax.bar_label(b2, color='w', label_type='center', fmt='%.1f')
-ax.bar_label(e2, color='w', label_type='center', fmt='%.1f')
-ax.bar_label(b3, color='w', label_type='center', fmt='%.1f')
-ax.bar_label(e3, color='w', label_type='center', fmt='%.1f')
-
-ax.legend(bbox_to_anchor=[0.5, 1.02], loc='center', ncol=3, frameon=False)
-ax.set_yticks(y + h / 2)
-ax.set_yticklabels(names)
-ax.set_xlabel('Final yield [wt. %]')
-style_barh(ax)
-
-# ---
-
-_, (ax1, ax2, ax3) = plt.subplots(ncols=3, figsize=(9, 4.8), sharey=True, tight_layout=True)
-
-ax1.barh(y, ycf_gas, color='C6')
-ax1.set_xlabel('Carbon')
-ax1.set_yticks(y)
-ax1.set_yticklabels(names)
-style_barh(ax1)
-
-ax2.barh(y, yhf_gas, color='C6')
-ax2.set_xlabel('Hydrogen')
-ax2.set_title('Gas phase CHO fractions (N₂ basis)')
-ax2.set_yticks(y)
-style_barh(ax2)
-
-ax3.barh(y, yof_gas, color='C6')
-ax3.set_xlabel('Oxygen')
-ax3.set_yticks(y)
-style_barh(ax3)
-
-# ---
-
-_, (ax1, ax2, ax3) = plt.subplots(ncols=3, figsize=(9, 4.8), sharey=True, tight_layout=True)
-
-ax1.barh(y, ycf_liquid, color='C4')
-ax1.set_xlabel('Carbon')
-ax1.set_yticks(y)
-ax1.set_yticklabels(names)
-style_barh(ax1)
-
-ax2.barh(y, yhf_liquid, color='C4')
-ax2.set_xlabel('Hydrogen')
-ax2.set_title('Liquid phase CHO fractions (N₂ basis)')
-ax2.set_yticks(y)
-style_barh(ax2)
-
-ax3.barh(y, yof_liquid, color='C4')
-ax3.set_xlabel('Oxygen')
-ax3.set_yticks(y)
-style_barh(ax3)
-
-
-# ---
-
-def style(ax):
-    ax.grid(color='0.9')
-    ax.tick_params(color='0.9')
-
-
-pfit_gas_model = np.poly1d(np.polyfit(exp_ash, yf_gases, 1))
-pfit_gas_exp = np.poly1d(np.polyfit(exp_ash, exp_gases, 1))
-
-pfit_liq_model = np.poly1d(np.polyfit(exp_ash, yf_liquids, 1))
-pfit_liq_exp = np.poly1d(np.polyfit(exp_ash, exp_liquids, 1))
-
-pfit_sld_model = np.poly1d(np.polyfit(exp_ash, yf_solids, 1))
-pfit_sld_exp = np.poly1d(np.polyfit(exp_ash, exp_solids, 1))
-
-_, (ax1, ax2, ax3) = plt.subplots(nrows=3, ncols=1, figsize=(4.8, 8), sharex=True, tight_layout=True)
-
-ax1.plot(exp_ash, yf_gases, 'ro', label='model')
-ax1.plot(exp_ash, pfit_gas_model(exp_ash), 'r')
-ax1.plot(exp_ash, exp_gases, 'ko', label='exp')
-ax1.plot(exp_ash, pfit_gas_exp(exp_ash), 'k')
-ax1.set_ylabel('Gases [wt. %]')
-style(ax1)
-
-ax2.plot(exp_ash, yf_liquids, 'ro', label='model')
-ax2.plot(exp_ash, pfit_liq_model(exp_ash), 'r')
-ax2.plot(exp_ash, exp_liquids, 'ko', label='exp')
-ax2.plot(exp_ash, pfit_liq_exp(exp_ash), 'k')
-ax2.set_ylabel('Liquids [wt. %]')
-ax2.legend(loc='best')
-style(ax2)
-
-ax3.plot(exp_ash, yf_solids, 'ro', label='model')
-ax3.plot(exp_ash, pfit_sld_model(exp_ash), 'r')
-ax3.plot(exp_ash, exp_solids, 'ko', label='exp')
-ax3.plot(exp_ash, pfit_sld_exp(exp_ash), 'k')
-ax3.set_xlabel('Ash [wt. %]')
-ax3.set_ylabel('Solids [wt. %]')
-style(ax3)
-
-plt.show()
+    exp_gases, exp_liquids, exp_solids = feedstock.lump2_yield
+    exp_ash = feedstock.prox_ad[2]
+
+    # Exit yields, exit CHO fractions, and experiment yields
+    return (feedstock.name, y_gas[-1], y_liquid[-1], y_solid[-1], y_metaplastic[-1],
+            yc_gases[-1], yh_gases[-1], yo_gases[-1],
+            yc_liquids[-1], yh_liquids[-1], yo_liquids[-1],
+            exp_gases, exp_liquids, exp_solids, exp_ash)
+
+
+if __name__ == '__main__':
+
+    # Command line options
+    # ------------------------------------------------------------------------
+
+    args = parse_args()
+
+    # Feedstocks
+    # ------------------------------------------------------------------------
+
+    fdata = load_fdata()
+
+    # only use feedstocks with residence time value
+    fdata = [fd for fd in fdata if 'residenceTime' in fd]
+
+    # Run CSTR reactor model for each feedstock in parallel
+    # ------------------------------------------------------------------------
+
+    # Parse the Cantera input file before starting the workers so forked
+    # processes inherit the loaded mechanism instead of parsing it again
+    rct.load_gas(cti)
+
+    with ProcessPoolExecutor(mp_context=rct.get_mp_context()) as executor:
+        records = list(executor.map(simulate_feedstock, range(len(fdata)), fdata))
+
+    # Store results for each feedstock as one record per feedstock
+    names = [r[0] for r in records]
+    nf = len(names)
+    results = np.array([r[1:] for r in records], dtype=results_dtype)
+
+    # Print
+    # ------------------------------------------------------------------------
+
+    print(f'\n{" CSTR model ":*^70}\n')
+
+    print(
+        'Parameters for reactor model\n'
+        f'diam       {diam} m\n'
+        f'length     {length} m\n'
+        f'temp       {temp} K\n'
+        f'p          {p:,} Pa\n'
+        f'n_cstrs    {n_cstrs}\n'
+        f'energy     {energy}\n'
+        f'cti file   {cti}'
+    )
+
+    w = max(len(name) for name in names)
+
+    print(
+        '\nFinal yields (N₂ free basis) and experiment yields, wt. ％\n'
+        f'{"":{w}}   {"gas":>6} {"liquid":>6} {"solid":>6} {"meta":>6}   '
+        f'{"exp gas":>7} {"liquid":>6} {"solid":>6} {"ash":>6}'
+    )
+    for name, r in zip(names, results):
+        print(
+            f'{name:{w}}   {r["yf_gases"] * 100:6.2f} {r["yf_liquids"] * 100:6.2f} '
+            f'{r["yf_solids"] * 100:6.2f} {r["yf_metas"] * 100:6.2f}   '
+            f'{r["exp_gases"]:7.2f} {r["exp_liquids"]:6.2f} {r["exp_solids"]:6.2f} {r["exp_ash"]:6.2f}'
+        )
+
+    print(
+        '\nFinal CHO fractions (N₂ basis)\n'
+        f'{"":{w}}   {"gas yc":>6} {"yh":>6} {"yo":>6}   {"liq yc":>6} {"yh":>6} {"yo":>6}'
+    )
+    for name, r in zip(names, results):
+        print(
+            f'{name:{w}}   {r["ycf_gas"]:6.2f} {r["yhf_gas"]:6.2f} {r["yof_gas"]:6.2f}   '
+            f'{r["ycf_liquid"]:6.2f} {r["yhf_liquid"]:6.2f} {r["yof_liquid"]:6.2f}'
+        )
+
+    # Plot
+    # ------------------------------------------------------------------------
+
+    if args.plot:
+        import matplotlib.pyplot as plt
+
+        def style_barh(ax):
+            ax.invert_yaxis()
+            ax.set_axisbelow(True)
+            ax.set_frame_on(False)
+            ax.tick_params(color='0.8')
+            ax.xaxis.grid(True, color='0.8')
+
+        def stacked_lefts(yf):
+            # Left edge of each stacked bar segment where the columns of `yf`
+            # are the segments, each segment starts at the sum of the previous
+            left = np.zeros_like(yf)
+            left[:, 1:] = np.cumsum(yf[:, :-1], axis=1)
+            return left
+
+        y = np.arange(nf)
+
+        # Final yields as weight percent
+        yf_gases = results['yf_gases'] * 100
+        yf_liquids = results['yf_liquids'] * 100
+        yf_solids = results['yf_solids'] * 100
+        yf_metas = results['yf_metas'] * 100
+        yf_solidmeta = yf_solids + yf_metas
+
+        _, ax = plt.subplots(tight_layout=True, figsize=(9, 4.8))
+        yf_phases = np.column_stack([yf_gases, yf_liquids, yf_solids, yf_metas])
+        lefts = stacked_lefts(yf_phases)
+        for k, (color, label) in enumerate(zip(('C6', 'C4', 'C2', 'C1'), ('Gases', 'Liquids', 'Solids', 'Metaplastics'))):
+            bars = ax.barh(y, yf_phases[:, k], left=lefts[:, k], color=color, label=label)
+            ax.bar_label(bars, color='w', label_type='center', fmt='%.1f')
+        ax.legend(bbox_to_anchor=[0.5, 1.02], loc='center', ncol=4, frameon=False)
+        ax.set_yticks(y)
+        ax.set_yticklabels(names)
+        ax.set_xlabel('Final yield [wt. %]')
+        style_barh(ax)
+
+        # ---
+
+        h = 0.4
+
+        _, ax = plt.subplots(tight_layout=True, figsize=(9, 4.8))
+
+        yf_model = np.column_stack([yf_gases, yf_liquids, yf_solidmeta])
+        yf_exp = np.column_stack([results['exp_gases'], results['exp_liquids'], results['exp_solids']])
+        lefts_model = stacked_lefts(yf_model)
+        lefts_exp = stacked_lefts(yf_exp)
+
+        for k, (color, label) in enumerate(zip(('C6', 'C4', 'C2'), ('Gases', 'Liquids', 'Solids'))):
+            bars = ax.barh(y, yf_model[:, k], edgecolor='k', left=lefts_model[:, k], height=h, color=color, label=label)
+            ax.bar_label(bars, color='w', label_type='center', fmt='%.1f')
+            bars = ax.barh(y + h, yf_exp[:, k], edgecolor='k', left=lefts_exp[:, k], height=h, color=color)
+            ax.bar_label(bars, color='w', label_type='center', fmt='%.1f')
+
+        ax.legend(bbox_to_anchor=[0.5, 1.02], loc='center', ncol=3, frameon=False)
+        ax.set_yticks(y + h / 2)
+        ax.set_yticklabels(names)
+        ax.set_xlabel('Final yield [wt. %]')
+        style_barh(ax)
+
+        # ---
+
+        _, (ax1, ax2, ax3) = plt.subplots(ncols=3, figsize=(9, 4.8), sharey=True, tight_layout=True)
+
+        ax1.barh(y, results['ycf_gas'], color='C6')
+        ax1.set_xlabel('Carbon')
+        ax1.set_yticks(y)
+        ax1.set_yticklabels(names)
+        style_barh(ax1)
+
+        ax2.barh(y, results['yhf_gas'], color='C6')
+        ax2.set_xlabel('Hydrogen')
+        ax2.set_title('Gas phase CHO fractions (N₂ basis)')
+        ax2.set_yticks(y)
+        style_barh(ax2)
+
+        ax3.barh(y, results['yof_gas'], color='C6')
+        ax3.set_xlabel('Oxygen')
+        ax3.set_yticks(y)
+        style_barh(ax3)
+
+        # ---
+
+        _, (ax1, ax2, ax3) = plt.subplots(ncols=3, figsize=(9, 4.8), sharey=True, tight_layout=True)
+
+        ax1.barh(y, results['ycf_liquid'], color='C4')
+        ax1.set_xlabel('Carbon')
+        ax1.set_yticks(y)
+        ax1.set_yticklabels(names)
+        style_barh(ax1)
+
+        ax2.barh(y, results['yhf_liquid'], color='C4')
+        ax2.set_xlabel('Hydrogen')
+        ax2.set_title('Liquid phase CHO fractions (N₂ basis)')
+        ax2.set_yticks(y)
+        style_barh(ax2)
+
+        ax3.barh(y, results['yof_liquid'], color='C4')
+        ax3.set_xlabel('Oxygen')
+        ax3.set_yticks(y)
+        style_barh(ax3)
+
+        # ---
+
+        def style(ax):
+            ax.grid(color='0.9')
+            ax.tick_params(color='0.9')
+
+        exp_ash = results['exp_ash']
+
+        # Linear fits of the yields to ash content, all fits share the same
+        # Vandermonde matrix so they are solved together
+        v = np.vander(exp_ash, 2)
+        b = np.column_stack([yf_gases, results['exp_gases'], yf_liquids, results['exp_liquids'],
+                             yf_solids, results['exp_solids']])
+        coeffs, *_ = np.linalg.lstsq(v, b, rcond=None)
+
+        # Trendline values at each ash content, one column per fit
+        (fit_gas_model, fit_gas_exp, fit_liq_model, fit_liq_exp,
+         fit_sld_model, fit_sld_exp) = (v @ coeffs).T
+
+        _, (ax1, ax2, ax3) = plt.subplots(nrows=3, ncols=1, figsize=(4.8, 8), sharex=True, tight_layout=True)
+
+        ax1.plot(exp_ash, yf_gases, 'ro', label='model')
+        ax1.plot(exp_ash, fit_gas_model, 'r')
+        ax1.plot(exp_ash, results['exp_gases'], 'ko', label='exp')
+        ax1.plot(exp_ash, fit_gas_exp, 'k')
+        ax1.set_ylabel('Gases [wt. %]')
+        style(ax1)
+
+        ax2.plot(exp_ash, yf_liquids, 'ro', label='model')
+        ax2.plot(exp_ash, fit_liq_model, 'r')
+        ax2.plot(exp_ash, results['exp_liquids'], 'ko', label='exp')
+        ax2.plot(exp_ash, fit_liq_exp, 'k')
+        ax2.set_ylabel('Liquids [wt. %]')
+        ax2.legend(loc='best')
+        style(ax2)
+
+        ax3.plot(exp_ash, yf_solids, 'ro', label='model')
+        ax3.plot(exp_ash, fit_sld_model, 'r')
+        ax3.plot(exp_ash, results['exp_solids'], 'ko', label='exp')
+        ax3.plot(exp_ash, fit_sld_exp, 'k')
+        ax3.set_xlabel('Ash [wt. %]')
+        ax3.set_ylabel('Solids [wt. %]')
+        style(ax3)
+
+        save_or_show('run_cstr_all', args.save)
@@ -18,11 +18,15 @@ A predictive model of biochar formation and characterization. Journal of
 Analytical and Applied Pyrolysis, vol. 134, pp. 326-335, 2018.
 """
 
-import chemics as cm
-import json
-import matplotlib.pyplot as plt
 import reactor as rct
-from feedstock import Feedstock
+from feedstock import Feedstock, load_fdata
+from figures import parse_args, save_or_show
+from inputs import calc_feed
+
+# Command line options
+# ----------------------------------------------------------------------------
+
+args = parse_args()
 
 # Parameters
 # ----------------------------------------------------------------------------
@@ -43,8 +47,7 @@ cti = 'data/debiagi_sw_metan2.cti'  # Cantera input file
 # Feedstock
 # ----------------------------------------------------------------------------
 
-with open("data/feedstocks.json") as json_file:
-    fdata = json.load(json_file)
+fdata = load_fdata()
 
 feedstock = Feedstock(fdata[0])     # change index to choose feedstock
 
@@ -61,19 +64,9 @@ y0_h2o = feedstock.prox_ad[3] / 100
 # Reactor inputs
 # ----------------------------------------------------------------------------
 
-# Convert biomass feedrate from g/hr to kg/s
-mf_bio = ghr_bio / 1000 / 3600
-
-# Convert nitrogen gas flowrate from SLM to kg/s
-# 1 m³/s = 60,000 liter/minute
-# N₂ gas molecular weight = 28 g/mol
-# N₂ gas density at STP = 1.2506 kg/m³
-lpm_n2 = cm.slm_to_lpm(slm_n2, p / 1000, temp)
-rhog_n2 = cm.rhog(28, 101325, 773.15)
-mf_n2 = lpm_n2 / 60_000 * rhog_n2
-
-# Mass fraction of nitrogen gas into reactor
-y0_n2 = mf_n2 / (mf_n2 + mf_bio)
+# Biomass and nitrogen gas mass flow rates [kg/s] and mass fraction of
+# nitrogen gas into reactor
+mf_bio, mf_n2, y0_n2 = calc_feed(ghr_bio, slm_n2, p, temp)
 
 # All mass fractions for reactor input
 y0 = {'N2': y0_n2, 'CELL': cell, 'GMSW': hemi, 'LIGC': ligc, 'LIGH': ligh,
@@ -85,18 +78,10 @@ y0 = {'N2': y0_n2, 'CELL': cell, 'GMSW': hemi, 'LIGC': ligc, 'LIGH': ligh,
 states = rct.run_cstr_simulation(cti, diam, length, n_cstrs, p, tau, temp, y0, energy)
 
 # Mass fractions of phases and nitrogen gas in each CSTR (N₂ basis)
-y_n2 = states('N2').Y[:, 0]
-y_gas_n2 = states(*rct.sp_gases_n2).Y.sum(axis=1)
-y_liquid_n2 = states(*rct.sp_liquids).Y.sum(axis=1)
-y_solid_n2 = states(*rct.sp_solids).Y.sum(axis=1)
-y_metaplastic_n2 = states(*rct.sp_metaplastics).Y.sum(axis=1)
+y_gas_n2, y_liquid_n2, y_solid_n2, y_metaplastic_n2, y_n2 = rct.get_yphases_n2(states)
 
 # Mass fractions of the phases excluding nitrogen gas in each CSTR (N₂ free basis)
-sum_no_n2 = y_gas_n2 + y_liquid_n2 + y_solid_n2 + y_metaplastic_n2 - y_n2
-y_gas = (y_gas_n2 - y_n2) / sum_no_n2
-y_liquid = y_liquid_n2 / sum_no_n2
-y_solid = y_solid_n2 / sum_no_n2
-y_metaplastic = y_metaplastic_n2 / sum_no_n2
+y_gas, y_liquid, y_solid, y_metaplastic = rct.n2_free_basis(y_gas_n2, y_liquid_n2, y_solid_n2, y_metaplastic_n2, y_n2)
 
 # Carbon, hydrogen, and oxygen fractions
 yc_gases, yh_gases, yo_gases = rct.get_ycho_gases(states)
@@ -153,67 +138,68 @@ print(
 print(
     '\nFinal mixture CHO fractions (N₂ basis)\n'
     '       gas   liquid\n'
-    f'yc    {yc_gases.sum(axis=1)[-1]:.2f}     {yc_liquids.sum(axis=1)[-1]:.2f}\n'
-    f'yh    {yh_gases.sum(axis=1)[-1]:.2f}     {yh_liquids.sum(axis=1)[-1]:.2f}\n'
-    f'yo    {yo_gases.sum(axis=1)[-1]:.2f}     {yo_liquids.sum(axis=1)[-1]:.2f}'
+    f'yc    {yc_gases[-1]:.2f}     {yc_liquids[-1]:.2f}\n'
+    f'yh    {yh_gases[-1]:.2f}     {yh_liquids[-1]:.2f}\n'
+    f'yo    {yo_gases[-1]:.2f}     {yo_liquids[-1]:.2f}'
 )
 
-
 # Plot
 # ----------------------------------------------------------------------------
 
-def _config(ax, xlabel, ylabel, title=None, legend=None):
-    """
-    Configure and style the plot figure.
-    """
-    ax.grid(True, color='0.9')
-    ax.set_frame_on(False)
-    ax.set_xlabel(xlabel)
-    ax.set_ylabel(ylabel)
-    ax.tick_params(color='0.9')
-
-    if legend == 'side':
-        ax.legend(loc='center left', bbox_to_anchor=(1, 0.5), frameon=False)
-    elif legend == 'best':
-        ax.legend(loc='best', frameon=False)
-
-
-# Yields for N₂ basis
-fig, (ax1, ax2, ax3) = plt.subplots(nrows=1, ncols=3, figsize=(10, 4.8), tight_layout=True)
-
-ax1.plot(y_gas_n2, label='gas')
-ax1.plot(y_liquid_n2, label='liquid')
-ax1.plot(y_solid_n2, label='solid')
-ax1.plot(y_metaplastic_n2, label='metaplastic')
-_config(ax1, xlabel='CSTR [-]', ylabel='Mass fraction [-]', legend='best')
-
-ax2.plot(states.T)
-_config(ax2, xlabel='CSTR [-]', ylabel='Temperature [K]')
-
-ax3.plot(states.P / 1000)
-_config(ax3, xlabel='CSTR [-]', ylabel='Pressure [kPa]')
-
-# Yields for N₂ free basis
-fig, (ax1, ax2, ax3) = plt.subplots(nrows=1, ncols=3, figsize=(10, 4.8), tight_layout=True)
-
-ax1.plot(y_gas, label='gas')
-ax1.plot(y_liquid, label='liquid')
-ax1.plot(y_solid, label='solid')
-ax1.plot(y_metaplastic, label='metaplastic')
-_config(ax1, xlabel='CSTR [-]', ylabel='Mass fraction [-]', legend='best')
-
-ax2.plot(states.T)
-_config(ax2, xlabel='CSTR [-]', ylabel='Temperature [K]')
-
-ax3.plot(states.P / 1000)
-_config(ax3, xlabel='CSTR [-]', ylabel='Pressure [kPa]')
-
-# Yield profiles for N₂ free basis
-_, ax = plt.subplots(tight_layout=True)
-ax.plot(y_gas, label='gas')
-ax.plot(y_liquid, label='liquid')
-ax.plot(y_solid, label='solid')
-ax.plot(y_metaplastic, label='metaplastic')
-_config(ax, xlabel='CSTR [-]', ylabel='Mass fraction (N₂ free basis) [-]', legend='best')
-
-plt.show()
+if args.plot:
+    import matplotlib.pyplot as plt
+
+    def _config(ax, xlabel, ylabel, title=None, legend=None):
+        """
+        Configure and style the plot figure.
+        """
+        ax.grid(True, color='0.9')
+        ax.set_frame_on(False)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.tick_params(color='0.9')
+
+        if legend == 'side':
+            ax.legend(loc='center left', bbox_to_anchor=(1, 0.5), frameon=False)
+        elif legend == 'best':
+            ax.legend(loc='best', frameon=False)
+
+    # Yields for N₂ basis
+    fig, (ax1, ax2, ax3) = plt.subplots(nrows=1, ncols=3, figsize=(10, 4.8), tight_layout=True)
+
+    ax1.plot(y_gas_n2, label='gas')
+    ax1.plot(y_liquid_n2, label='liquid')
+    ax1.plot(y_solid_n2, label='solid')
+    ax1.plot(y_metaplastic_n2, label='metaplastic')
+    _config(ax1, xlabel='CSTR [-]', ylabel='Mass fraction [-]', legend='best')
+
+    ax2.plot(states.T)
+    _config(ax2, xlabel='CSTR [-]', ylabel='Temperature [K]')
+
+    ax3.plot(states.P / 1000)
+    _config(ax3, xlabel='CSTR [-]', ylabel='Pressure [kPa]')
+
+    # Yields for N₂ free basis
+    fig, (ax1, ax2, ax3) = plt.subplots(nrows=1, ncols=3, figsize=(10, 4.8), tight_layout=True)
+
+    ax1.plot(y_gas, label='gas')
+    ax1.plot(y_liquid, label='liquid')
+    ax1.plot(y_solid, label='solid')
+    ax1.plot(y_metaplastic, label='metaplastic')
+    _config(ax1, xlabel='CSTR [-]', ylabel='Mass fraction [-]', legend='best')
+
+    ax2.plot(states.T)
+    _config(ax2, xlabel='CSTR [-]', ylabel='Temperature [K]')
+
+    ax3.plot(states.P / 1000)
+    _config(ax3, xlabel='CSTR [-]', ylabel='Pressure [kPa]')
+
+    # Yield profiles for N₂ free basis
+    _, ax = plt.subplots(tight_layout=True)
+    ax.plot(y_gas, label='gas')
+    ax.plot(y_liquid, label='liquid')
+    ax.plot(y_solid, label='solid')
+    ax.plot(y_metaplastic, label='metaplastic')
+    _config(ax, xlabel='CSTR [-]', ylabel='Mass fraction (N₂ free basis) [-]', legend='best')
+
+    save_or_show('run_cstr_single', args.save)
@@ -3,37 +3,39 @@ Experimental yield data and calculated lumped yields for all FCIC feedstocks.
 Compare experiment yields to feedstock ash content.
 """
 
-import json
-import matplotlib.pyplot as plt
 import numpy as np
-from feedstock import Feedstock
+from feedstock import load_feedstocks
+from figures import parse_args, save_or_show
 
-# Feedstock parameters
+# Command line options
 # ----------------------------------------------------------------------------
 
-with open("data/feedstocks.json") as json_file:
-    fdata = json.load(json_file)
+args = parse_args()
+
+# Feedstock parameters
+# ----------------------------------------------------------------------------
 
-feedstocks = [Feedstock(fd) for fd in fdata]
+feedstocks = load_feedstocks()
 
 # Experimental yields
 # ----------------------------------------------------------------------------
 
-ash = []
-char = []
-oil = []
-liquids = []
+# Yields and ash content where each row is a feedstock
+exp_yields = np.array([f.exp_yield for f in feedstocks])
+normexp_yields = np.array([f.normexp_yield for f in feedstocks])
+lump_yields = np.array([f.lump_yield for f in feedstocks])
+normlump_yields = np.array([f.normlump_yield for f in feedstocks])
 
-for feedstock in feedstocks:
-    exp_yield = feedstock.exp_yield
-    normexp_yield = feedstock.normexp_yield
-    lump_yield = feedstock.lump_yield
-    normlump_yield = feedstock.normlump_yield
+ash = np.array([f.prox_ad[2] for f in feedstocks])
+char = exp_yields[:, 4]
+oil = exp_yields[:, 0]
+liquids = lump_yields[:, 1]
 
-    ash.append(feedstock.prox_ad[2])
-    char.append(exp_yield[4])
-    oil.append(exp_yield[0])
-    liquids.append(lump_yield[1])
+for i, feedstock in enumerate(feedstocks):
+    exp_yield = exp_yields[i]
+    normexp_yield = normexp_yields[i]
+    lump_yield = lump_yields[i]
+    normlump_yield = normlump_yields[i]
 
     print(
         f'\n{" " + feedstock.name + ", Cycle " + str(feedstock.cycle) + " ":*^70}\n\n'
@@ -43,7 +45,7 @@ for feedstock in feedstocks:
         f'light gas          {exp_yield[2]:>8} {normexp_yield[2]:>8.2f}\n'
         f'water vapor        {exp_yield[3]:>8} {normexp_yield[3]:>8.2f}\n'
         f'char               {exp_yield[4]:>8} {normexp_yield[4]:>8.2f}\n'
-        f'total              {sum(exp_yield):>8.2f} {sum(normexp_yield):>8.2f}'
+        f'total              {exp_yield.sum():>8.2f} {normexp_yield.sum():>8.2f}'
     )
 
     print(
@@ -51,59 +53,55 @@ for feedstock in feedstocks:
         f'gases              {lump_yield[0]:>8.2f} {normlump_yield[0]:>8.2f}\n'
         f'liquids            {lump_yield[1]:>8.2f} {normlump_yield[1]:>8.2f}\n'
         f'char               {lump_yield[2]:>8.2f} {normlump_yield[2]:>8.2f}\n'
-        f'total              {sum(lump_yield):>8.2f} {sum(normlump_yield):>8.2f}'
+        f'total              {lump_yield.sum():>8.2f} {normlump_yield.sum():>8.2f}'
     )
 
 
 # Plot
 # ----------------------------------------------------------------------------
 
-def style(ax):
-    ax.grid(color='0.9')
-    ax.set_frame_on(False)
-    ax.tick_params(color='0.9')
-
-
-# Trendlines
-z1 = np.polyfit(ash, oil, 1)
-p1 = np.poly1d(z1)
-
-z2 = np.polyfit(ash, char, 1)
-p2 = np.poly1d(z2)
-
-z3 = np.polyfit(ash, liquids, 1)
-p3 = np.poly1d(z3)
-
-# Yields vs ash content and show trendline
-_, (ax1, ax2, ax3) = plt.subplots(nrows=1, ncols=3, figsize=(9, 4.8), sharey=True, tight_layout=True)
-
-ax1.plot(ash, oil, 'o')
-ax1.plot(ash, p1(ash))
-ax1.set_ylabel('Experiment yield [wt. %]')
-ax1.set_title('Oil')
-style(ax1)
-
-ax2.plot(ash, char, 'o')
-ax2.plot(ash, p2(ash))
-ax2.set_xlabel('Feedstock ash [wt. %]')
-ax2.set_title('Char')
-style(ax2)
-
-ax3.plot(ash, liquids, 'o')
-ax3.plot(ash, p3(ash))
-ax3.set_title('Liquids')
-style(ax3)
-
-# Yields for each feedstock
-labels = ['oil', 'condensables', 'light gas', 'water vapor', 'char']
-
-_, ax = plt.subplots(tight_layout=True)
-for f in feedstocks:
-    ax.plot(f.exp_yield, 'o')
-ax.set_ylabel('Weight % (wet basis)')
-ax.set_xlabel('Experiment yield')
-ax.set_xticks(range(len(labels)))
-ax.set_xticklabels(labels)
-style(ax)
-
-plt.show()
+if args.plot:
+    import matplotlib.pyplot as plt
+
+    def style(ax):
+        ax.grid(color='0.9')
+        ax.set_frame_on(False)
+        ax.tick_params(color='0.9')
+
+    # Trendlines
+    z1 = np.polyfit(ash, oil, 1)
+    z2 = np.polyfit(ash, char, 1)
+    z3 = np.polyfit(ash, liquids, 1)
+
+    # Yields vs ash content and show trendline
+    _, (ax1, ax2, ax3) = plt.subplots(nrows=1, ncols=3, figsize=(9, 4.8), sharey=True, tight_layout=True)
+
+    ax1.plot(ash, oil, 'o')
+    ax1.plot(ash, np.polyval(z1, ash))
+    ax1.set_ylabel('Experiment yield [wt. %]')
+    ax1.set_title('Oil')
+    style(ax1)
+
+    ax2.plot(ash, char, 'o')
+    ax2.plot(ash, np.polyval(z2, ash))
+    ax2.set_xlabel('Feedstock ash [wt. %]')
+    ax2.set_title('Char')
+    style(ax2)
+
+    ax3.plot(ash, liquids, 'o')
+    ax3.plot(ash, np.polyval(z3, ash))
+    ax3.set_title('Liquids')
+    style(ax3)
+
+    # Yields for each feedstock
+    labels = ['oil', 'condensables', 'light gas', 'water vapor', 'char']
+
+    _, ax = plt.subplots(tight_layout=True)
+    ax.plot(np.arange(len(labels)), exp_yields.T, 'o')
+    ax.set_ylabel('Weight % (wet basis)')
+    ax.set_xlabel('Experiment yield')
+    ax.set_xticks(range(len(labels)))
+    ax.set_xticklabels(labels)
+    style(ax)
+
+    save_or_show('run_exp_yields', args.save)
@@ -4,69 +4,74 @@ spreadsheet and convert the as-determined basis (ad) to other bases. Compare
 the max wt. % difference of as-determined values for each feedstock.
 """
 
-import json
-import matplotlib.pyplot as plt
 import numpy as np
-from feedstock import Feedstock
+from feedstock import Feedstocks, load_fdata
+from figures import parse_args, save_or_show
 
 np.set_printoptions(precision=4, suppress=True)
 
+# Command line options
+# ----------------------------------------------------------------------------
+
+args = parse_args()
+
 # Feedstocks
 # ----------------------------------------------------------------------------
 
-with open("data/feedstocks.json") as json_file:
-    fdata = json.load(json_file)
+fdata = load_fdata()
 
-feedstocks = [Feedstock(f) for f in fdata]
+feedstocks = Feedstocks(fdata)
 
 # Proximate and ultimate analysis data
 # ----------------------------------------------------------------------------
 
-n = len(feedstocks)
-proxs_ad = np.zeros((n, 4))
-ults_ad = np.zeros((n, 7))
 
-for i, feedstock in enumerate(feedstocks):
-    proxs_ad[i] = feedstock.prox_ad
-    ults_ad[i] = feedstock.ult_ad
+def _row(label, values, width):
+    """
+    Table row where the first value is right-aligned to column `width` and
+    the other values are in columns of 10 characters.
+    """
+    first, *rest = values
+    return f'{label}{first:>{width - len(label)}.2f}' + ''.join(f' {v:>10.2f}' for v in rest)
+
+
+proxs_ad = feedstocks.prox_ad
+ults_ad = feedstocks.ult_ad
 
-    prox_ad = feedstock.prox_ad
-    prox_ar = feedstock.prox_ar
-    prox_d = feedstock.prox_d
-    prox_daf = feedstock.prox_daf
+for i, name in enumerate(feedstocks.name):
+    prox_ad = feedstocks.prox_ad[i]
+    prox_ar = feedstocks.prox_ar[i]
+    prox_d = feedstocks.prox_d[i]
+    prox_daf = feedstocks.prox_daf[i]
 
-    ult_ad = feedstock.ult_ad
-    ult_ar = feedstock.ult_ar
-    ult_d = feedstock.ult_d
-    ult_daf = feedstock.ult_daf
-    ult_cho = feedstock.ult_cho
+    ult_ad = feedstocks.ult_ad[i]
+    ult_ar = feedstocks.ult_ar[i]
+    ult_d = feedstocks.ult_d[i]
+    ult_daf = feedstocks.ult_daf[i]
+    ult_cho = feedstocks.ult_cho[i]
 
-    sum_ult_ad = sum(ult_ad) - ult_ad[6]  # exclude moisture content
+    sum_ult_ad = ult_ad[:6].sum()  # exclude moisture content
 
-    print(f'\n{" " + feedstock.name + ", Cycle " + str(feedstock.cycle) + " ":*^70}\n')
+    print(f'\n{" " + name + ", Cycle " + str(feedstocks.cycle[i]) + " ":*^70}\n')
 
     print('Proximate analysis wt. %')
     print(f'{"ad":>13} {"ar":>10} {"d":>10}{"daf":>11}')
-    print(f'FC {prox_ad[0]:>10.2f} {prox_ar[0]:>10.2f} {prox_d[0]:>10.2f} {prox_daf[0]:>10.2f}')
-    print(f'VM {prox_ad[1]:>10.2f} {prox_ar[1]:>10.2f} {prox_d[1]:>10.2f} {prox_daf[1]:>10.2f}')
-    print(f'ash {prox_ad[2]:>9.2f} {prox_ar[2]:>10.2f} {prox_d[2]:>10.2f}')
-    print(f'M {prox_ad[3]:>11.2f} {prox_ar[3]:>10.2f}')
-    print(f'Σ {sum(prox_ad):>11.2f} {sum(prox_ar):>10.2f} {sum(prox_d):>10.2f} {sum(prox_daf):>10.2f}')
+    prox_bases = (prox_ad, prox_ar, prox_d, prox_daf)
+    for j, label in enumerate(('FC', 'VM', 'ash', 'M')):
+        print(_row(label, [b[j] for b in prox_bases if j < len(b)], 13))
+    print(_row('Σ', [b.sum() for b in prox_bases], 13))
 
     print('\nUltimate analysis wt. %')
     print('★ reported H and O for ad-basis excludes H and O in moisture')
     print(f'{"ad":>10} {"ar":>10} {"d":>10} {"daf":>10} {"cho":>10}')
-    print(f'C {ult_ad[0]:>9.2f} {ult_ar[0]:>10.2f} {ult_d[0]:>10.2f} {ult_daf[0]:>10.2f} {ult_cho[0]:>10.2f}')
-    print(f'H {ult_ad[1]:>9.2f} {ult_ar[1]:>10.2f} {ult_d[1]:>10.2f} {ult_daf[1]:>10.2f} {ult_cho[1]:>10.2f}')
-    print(f'O {ult_ad[2]:>9.2f} {ult_ar[2]:>10.2f} {ult_d[2]:>10.2f} {ult_daf[2]:>10.2f} {ult_cho[2]:>10.2f}')
-    print(f'N {ult_ad[3]:>9.2f} {ult_ar[3]:>10.2f} {ult_d[3]:>10.2f} {ult_daf[3]:>10.2f}')
-    print(f'S {ult_ad[4]:>9.2f} {ult_ar[4]:>10.2f} {ult_d[4]:>10.2f} {ult_daf[4]:>10.2f}')
-    print(f'ash {ult_ad[5]:>7.2f} {ult_ar[5]:>10.2f} {ult_d[5]:>10.2f}')
+    ult_bases = (ult_ad, ult_ar, ult_d, ult_daf, ult_cho)
+    for j, label in enumerate(('C', 'H', 'O', 'N', 'S', 'ash')):
+        print(_row(label, [b[j] for b in ult_bases if j < len(b)], 11))
     print(f'M {ult_ad[6]:>9.2f}★ {ult_ar[6]:>9.2f}')
-    print(f'Σ {sum_ult_ad:>9.2f} {sum(ult_ar):>10.2f} {sum(ult_d):>10.2f} {sum(ult_daf):>10.2f} {sum(ult_cho):>10.2f}')
+    print(_row('Σ', [sum_ult_ad] + [b.sum() for b in ult_bases[1:]], 11))
 
 # Max weight percent difference for FC, VM, ash, moisture for as-determined basis
-wt_max = [max(col) - min(col) for col in proxs_ad.T]
+wt_max = np.ptp(proxs_ad, axis=0)
 
 print(f'\n{" Max wt. ％ difference for all FC, VM, ash, moisture (ad) ":*^70}\n')
 print(f'FC       {wt_max[0]:.2f}')
@@ -75,7 +80,7 @@ print(f'ash      {wt_max[2]:.2f}')
 print(f'moisture {wt_max[3]:.2f}')
 
 # Max weight percent difference for C, H, O, N, S for as-determined basis
-wt_max = [max(col) - min(col) for col in ults_ad.T]
+wt_max = np.ptp(ults_ad, axis=0)
 
 print(f'\n{" Max wt. ％ difference for all C, H, O, N, S (ad) ":*^70}\n')
 print(f'C  {wt_max[0]:.2f}')
@@ -88,31 +93,31 @@ print(f'S  {wt_max[4]:.2f}')
 # Plot
 # ----------------------------------------------------------------------------
 
-def style(ax):
-    ax.grid(color='0.9')
-    ax.set_frame_on(False)
-    ax.tick_params(color='0.9')
+if args.plot:
+    import matplotlib.pyplot as plt
 
+    def style(ax):
+        ax.grid(color='0.9')
+        ax.set_frame_on(False)
+        ax.tick_params(color='0.9')
 
-_, (ax1, ax2) = plt.subplots(nrows=1, ncols=2, figsize=(10, 4.8), tight_layout=True)
+    _, (ax1, ax2) = plt.subplots(nrows=1, ncols=2, figsize=(10, 4.8), tight_layout=True)
 
-labels = ['FC', 'VM', 'ash', 'moisture']
+    labels = ['FC', 'VM', 'ash', 'moisture']
 
-for p in proxs_ad:
-    ax1.plot(p, 'o')
-ax1.set_ylabel('Weight % (as-determined)')
-ax1.set_xlabel('Proximate analysis')
-ax1.set_xticks(range(len(labels)))
-ax1.set_xticklabels(labels)
-style(ax1)
+    ax1.plot(np.arange(4), proxs_ad.T, 'o')
+    ax1.set_ylabel('Weight % (as-determined)')
+    ax1.set_xlabel('Proximate analysis')
+    ax1.set_xticks(range(len(labels)))
+    ax1.set_xticklabels(labels)
+    style(ax1)
 
-labels = ['C', 'H', 'O', 'N', 'S']
+    labels = ['C', 'H', 'O', 'N', 'S']
 
-for u in ults_ad:
-    ax2.plot(u[:5], 'o')
-ax2.set_xlabel('Ultimate analysis')
-ax2.set_xticks(range(len(labels)))
-ax2.set_xticklabels(labels)
-style(ax2)
+    ax2.plot(np.arange(5), ults_ad[:, :5].T, 'o')
+    ax2.set_xlabel('Ultimate analysis')
+    ax2.set_xticks(range(len(labels)))
+    ax2.set_xticklabels(labels)
+    style(ax2)
 
-plt.show()
+    save_or_show('run_prox_ultimate', args.save)
@@ -4,20 +4,35 @@ calculated fractions are used in the reactor models.
 """
 
 import chemics as cm
+import functools
+import numpy as np
 
+# Atomic weights of C, H, and O
+mw_cho = np.array([cm.mw('C'), cm.mw('H'), cm.mw('O')])
 
-def get_mw_total(species):
-    mw_total = 0
-    for i in range(len(species)):
-        sp = species[i]
-        mw_sp = cm.mw(sp)
-        mw_total += mw_sp
-    return mw_total
 
+@functools.lru_cache(maxsize=None)
+def get_mw(formula):
+    """
+    Molecular weight of a species formula. Each formula is only parsed once
+    when species are listed more than once.
+    """
+    return cm.mw(formula)
+
+
+def calc_ycho(species, mol_c, mol_h, mol_o):
+    """
+    Mass fractions of C, H, and O for each species from the number of C, H,
+    and O atoms in the species. Each row of the returned array is a species.
+    The atoms of each species are checked against its molecular weight.
+    """
+    mass_cho = np.column_stack([mol_c, mol_h, mol_o]) * mw_cho
+    mw_sp = np.array([get_mw(sp) for sp in species])
+    for sp, mass, mw in zip(species, mass_cho.sum(axis=1), mw_sp):
+        if not np.isclose(mass, mw):
+            raise ValueError(f'number of C, H, O atoms does not match species {sp}')
+    return mass_cho / mw_sp[:, np.newaxis]
 
-mw_c = cm.mw('C')
-mw_h = cm.mw('H')
-mw_o = cm.mw('O')
 
 # Gas species
 # ----------------------------------------------------------------------------
@@ -27,15 +42,11 @@ mol_c = [2, 2, 1, 1, 1, 1, 0]
 mol_h = [4, 6, 2, 4, 0, 0, 2]
 mol_o = [0, 0, 1, 0, 1, 2, 0]
 
+ycho = calc_ycho(sp_gases, mol_c, mol_h, mol_o)
+
 print('Gases       yc       yh       yo')
-for i in range(len(sp_gases)):
-    sp = sp_gases[i]
-    mw_sp = cm.mw(sp)
-    yc = mol_c[i] * mw_c / mw_sp
-    yh = mol_h[i] * mw_h / mw_sp
-    yo = mol_o[i] * mw_o / mw_sp
+for sp, (yc, yh, yo) in zip(sp_gases, ycho):
     total = yc + yh + yo
-
     print(f'{sp:6} {yc:>8.2f} {yh:>8.2f} {yo:>8.2f} {total:>8.2f}')
 
 # Liquid species
@@ -51,13 +62,9 @@ mol_c = [3, 3, 2, 5, 6, 7, 6, 6, 24, 3, 2, 2, 2, 1, 2, 7, 5, 0, 1, 19, 13, 8]
 mol_h = [4, 6, 6, 8, 10, 8, 6, 6, 28, 6, 4, 4, 4, 4, 2, 8, 4, 2, 2, 34, 22, 8]
 mol_o = [1, 1, 1, 4, 5, 1, 1, 3, 4, 2, 2, 1, 2, 1, 2, 1, 2, 1, 2, 2, 2, 3]
 
+ycho = calc_ycho(sp_liquids, mol_c, mol_h, mol_o)
+
 print('\nLiquids       yc       yh       yo')
-for i in range(len(sp_liquids)):
-    sp = sp_liquids[i]
-    mw_sp = cm.mw(sp)
-    yc = mol_c[i] * mw_c / mw_sp
-    yh = mol_h[i] * mw_h / mw_sp
-    yo = mol_o[i] * mw_o / mw_sp
+for sp, (yc, yh, yo) in zip(sp_liquids, ycho):
     total = yc + yh + yo
-
     print(f'{sp:8} {yc:>8.2f} {yh:>8.2f} {yo:>8.2f} {total:>8.2f}')